@@ -0,0 +1,106 @@
+/**
+ * Client for the sharded search index built by scripts/build_search_index.py
+ * Only the shards holding the terms of a query are downloaded, and each shard
+ * is fetched at most once per page. The tokenizer mirrors the Python one.
+ *
+ * The page names the index manifest in the data-index attribute of the script
+ * tag (see _pages/search.html); shards are fetched from next to it.
+ *
+ * Usage: SiteSearch.search('gradient descent 梯度下降').then(results => ...)
+ */
+
+(function() {
+  'use strict';
+
+  const STOP_WORDS = new Set((
+    'a an and are as at be but by can for from has have if in into is it its of on ' +
+    'or our so such than that the their then there these this to was we were what ' +
+    'when which will with you your').split(' '));
+  const CJK = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff';
+  const TOKEN_RE = new RegExp('[a-z0-9]+|[' + CJK + ']+', 'g');
+  const CJK_RE = new RegExp('^[' + CJK + ']');
+
+  let indexPromise = null;
+  const shardPromises = {};
+
+  function baseUrl() {
+    const script = document.querySelector('script[src*="search-index.js"]');
+    if (script && script.dataset.index) return script.dataset.index.replace(/[^\/]*$/, '');
+    return script ? script.src.replace(/js\/search-index\.js.*$/, 'search/') : '/assets/search/';
+  }
+
+  /**
+   * Split text into index terms: ASCII words and CJK character bigrams
+   */
+  function tokenize(text) {
+    const tokens = [];
+    const runs = text.normalize('NFKC').toLowerCase().match(TOKEN_RE) || [];
+    runs.forEach(function(run) {
+      if (CJK_RE.test(run)) {
+        if (run.length === 1) {
+          tokens.push(run);
+        }
+        for (let i = 0; i < run.length - 1; i++) {
+          tokens.push(run.slice(i, i + 2));
+        }
+      } else if (run.length > 1 && !STOP_WORDS.has(run)) {
+        tokens.push(run);
+      }
+    });
+    return tokens;
+  }
+
+  function shardKey(term) {
+    const code = term.charCodeAt(0);
+    return code < 128 ? term[0] : 'u' + (code >> 8).toString(16).padStart(2, '0');
+  }
+
+  function fetchJSON(url) {
+    return fetch(url).then(function(response) {
+      if (!response.ok) throw new Error('Failed to load ' + url);
+      return response.json();
+    });
+  }
+
+  function loadIndex() {
+    if (!indexPromise) indexPromise = fetchJSON(baseUrl() + 'index.json');
+    return indexPromise;
+  }
+
+  function loadShard(key) {
+    if (!shardPromises[key]) shardPromises[key] = fetchJSON(baseUrl() + 'shards/' + key + '.json');
+    return shardPromises[key];
+  }
+
+  /**
+   * Rank documents by the summed tf-idf of the query terms they contain
+   */
+  function search(query, limit) {
+    const terms = Array.from(new Set(tokenize(query)));
+    return loadIndex().then(function(index) {
+      const available = new Set(index.shards);
+      const keys = Array.from(new Set(terms.map(shardKey))).filter(function(key) { return available.has(key); });
+      return Promise.all(keys.map(loadShard)).then(function(shards) {
+        const byKey = {};
+        keys.forEach(function(key, i) { byKey[key] = shards[i]; });
+
+        const total = Object.keys(index.documents).length;
+        const scores = {};
+        terms.forEach(function(term) {
+          const postings = (byKey[shardKey(term)] || {})[term] || [];
+          const idf = Math.log(1 + total / (postings.length || 1));
+          postings.forEach(function(posting) {
+            scores[posting[0]] = (scores[posting[0]] || 0) + posting[1] * idf;
+          });
+        });
+
+        return Object.keys(scores)
+          .sort(function(a, b) { return scores[b] - scores[a]; })
+          .slice(0, limit || 20)
+          .map(function(id) { return Object.assign({ score: scores[id] }, index.documents[id]); });
+      });
+    });
+  }
+
+  window.SiteSearch = { search: search, tokenize: tokenize };
+})();
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Single-pass image insertion engine for the ML blog posts
+
+All search anchors of a post are compiled into one Aho-Corasick automaton,
+the post is walked once to find every insertion point, and the file is
+rebuilt in one pass, instead of rescanning the post and shifting the line
+list for every image.
+
+An anchor is (search, image_md[, occurrence[, offset[, next_line]]]):
+the image is inserted `offset` lines after the `occurrence`-th line that
+contains `search` (and, if `next_line` is given, whose following line
+contains `next_line`). Anchors only match the original lines of the post
+body, never its YAML front matter, and images sharing an insertion point
+keep the order of their anchors.
+
+The anchors of each post live in a manifest under image_manifests/ (YAML or
+JSON, `post:` plus a list of `images:` with the Anchor fields). Applying the
+manifests is idempotent: images whose URL already appears in the post are
+skipped, image lines are never used as anchors, and a post is only rewritten
+when something was inserted. Run from the repository root:
+
+    python image_insertion.py              # apply every manifest
+    python image_insertion.py --check      # exit 1 if images or anchors are missing
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import tempfile
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+Anchor = namedtuple('Anchor', ['search', 'image_md', 'occurrence', 'offset', 'next_line'],
+                    defaults=(1, 1, None))
+
+MANIFEST_DIR = 'image_manifests'
+IMAGE_URL = re.compile(r'!\[[^\]]*\]\(\s*<?([^)\s>]+)')
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton reporting which patterns occur in a text."""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [set()]
+
+        for pattern in patterns:
+            node = 0
+            for char in pattern:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(set())
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].add(pattern)
+
+        # Breadth-first construction of the failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] |= self.output[self.fail[child]]
+
+    def find(self, text):
+        """Return the set of patterns that occur anywhere in text."""
+        found = set()
+        node = 0
+        for char in text:
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            if self.output[node]:
+                found |= self.output[node]
+        return found
+
+
+def front_matter_end(lines):
+    """Return the index of the first line after the front matter, or 0 if there is none."""
+    if not lines or lines[0].rstrip() != '---':
+        return 0
+    for i in range(1, len(lines)):
+        if lines[i].rstrip() == '---':
+            return i + 1
+    return 0
+
+
+def plan_insertions(lines, anchors, ignore=None):
+    """Walk lines once and resolve every anchor to an insertion index.
+
+    The front matter and lines for which ignore(line) is true never match
+    an anchor. Returns
+    (insertions, missing): a list of (index, anchor) pairs, where the image
+    goes before lines[index], and the anchors that did not match.
+    """
+    anchors = [Anchor(*anchor) for anchor in anchors]
+    by_search = {}
+    for number, anchor in enumerate(anchors):
+        by_search.setdefault(anchor.search, []).append(number)
+
+    matcher = PatternMatcher(by_search)
+    seen = [0] * len(anchors)
+    positions = [None] * len(anchors)
+    unresolved = len(anchors)
+
+    for i in range(front_matter_end(lines), len(lines)):
+        if not unresolved:
+            break
+        line = lines[i]
+        if ignore is not None and ignore(line):
+            continue
+        for search in matcher.find(line):
+            for number in by_search[search]:
+                anchor = anchors[number]
+                if positions[number] is not None:
+                    continue
+                if anchor.next_line is not None and (i + 1 >= len(lines) or anchor.next_line not in lines[i + 1]):
+                    continue
+                seen[number] += 1
+                if seen[number] == anchor.occurrence:
+                    positions[number] = min(i + anchor.offset, len(lines))
+                    unresolved -= 1
+
+    insertions = [(positions[number], anchor) for number, anchor in enumerate(anchors)
+                  if positions[number] is not None]
+    missing = [anchor for number, anchor in enumerate(anchors) if positions[number] is None]
+    return insertions, missing
+
+
+def insert_images(lines, anchors, ignore=None):
+    """Return (new_lines, inserted, missing) with all anchored images inserted."""
+    insertions, missing = plan_insertions(lines, anchors, ignore)
+
+    blocks = {}
+    for index, anchor in insertions:
+        blocks.setdefault(index, []).append(f'\n{anchor.image_md}\n\n')
+
+    new_lines = []
+    for index, line in enumerate(lines):
+        new_lines.extend(blocks.get(index, ()))
+        new_lines.append(line)
+    new_lines.extend(blocks.get(len(lines), ()))
+    return new_lines, len(insertions), missing
+
+
+def image_url(image_md):
+    """Return the URL of a markdown image, or the text itself if it has none."""
+    match = IMAGE_URL.search(image_md)
+    return match.group(1) if match else image_md.strip()
+
+
+def is_image_line(line):
+    """True for lines holding an image, which never serve as anchors."""
+    line = line.lstrip()
+    return line.startswith('![') or line.startswith('{% include post-image.html')
+
+
+def load_manifest(path):
+    """Return (post, anchors) from a YAML or JSON image manifest."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.json'):
+            manifest = json.load(f)
+        else:
+            manifest = yaml.safe_load(f)
+    anchors = [Anchor(**entry) for entry in manifest.get('images') or []]
+    return manifest['post'], anchors
+
+
+def pending_anchors(text, anchors):
+    """Split anchors into those whose image is not yet in text and the rest."""
+    pending, present = [], []
+    urls = set()
+    for anchor in anchors:
+        url = image_url(anchor.image_md)
+        if url in urls or url in text:
+            present.append(anchor)
+        else:
+            pending.append(anchor)
+        urls.add(url)
+    return pending, present
+
+
+def write_if_changed(path, text):
+    """Atomically write text to path unless it already holds it; True if written."""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def apply_manifest(manifest_file, root='.', check=False):
+    """Insert the images of one manifest that its post does not have yet.
+
+    With check=True nothing is written. Returns a dict with the post path,
+    the number of images "inserted" (or that would be), already "present",
+    the "missing" anchor searches and whether the post was "written".
+    """
+    post, anchors = load_manifest(manifest_file)
+    filepath = os.path.join(root, post)
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+
+    pending, present = pending_anchors(text, anchors)
+    lines, inserted, missing = insert_images(text.splitlines(keepends=True), pending, is_image_line)
+
+    written = False
+    if inserted and not check:
+        written = write_if_changed(filepath, ''.join(lines))
+    return {'post': post, 'inserted': inserted, 'present': len(present),
+            'missing': [anchor.search for anchor in missing], 'written': written}
+
+
+def _apply_manifest(args):
+    return apply_manifest(*args)
+
+
+def apply_manifests(manifest_files, root='.', check=False, jobs=1):
+    """Apply manifests concurrently, one post per task, in manifest order."""
+    tasks = [(manifest_file, root, check) for manifest_file in manifest_files]
+    if jobs == 1 or len(tasks) < 2:
+        return [apply_manifest(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_apply_manifest, tasks))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Insert the images listed in image manifests into their posts')
+    parser.add_argument('manifests', nargs='*',
+                        help=f'Manifest files (default: {MANIFEST_DIR}/*.yml, *.yaml and *.json)')
+    parser.add_argument('--root', default='.', help='Repository root the post paths are relative to')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='Posts processed in parallel (default: 0, one per CPU)')
+    parser.add_argument('--check', action='store_true',
+                        help='Write nothing and exit with status 1 if any post is missing images '
+                             'or any anchor matches nothing')
+    args = parser.parse_args(argv)
+
+    manifest_files = args.manifests or sorted(
+        path for ext in ('yml', 'yaml', 'json')
+        for path in glob.glob(os.path.join(args.root, MANIFEST_DIR, f'*.{ext}')))
+    jobs = args.jobs or os.cpu_count() or 1
+
+    results = apply_manifests(manifest_files, args.root, args.check, jobs)
+    for result in results:
+        action = 'would insert' if args.check else 'inserted'
+        print(f"{result['post']}: {action} {result['inserted']}, {result['present']} already present")
+        for search in result['missing']:
+            print(f'  Anchor not found: {search!r}')
+
+    pending = sum(result['inserted'] for result in results)
+    unmatched = sum(len(result['missing']) for result in results)
+    written = sum(result['written'] for result in results)
+    if args.check:
+        print(f'{pending} images missing from {len(results)} posts, {unmatched} anchors not found')
+        return 1 if pending or unmatched else 0
+    print(f'Inserted {pending} images, rewrote {written} of {len(results)} posts')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""Mirror remote post images locally and serve them as responsive variants
+
+Every remote image referenced by the posts is downloaded once into the
+content-addressed store images/posts/ as {sha256[:16]}.{ext}, resized
+WebP/AVIF variants {name}-{width}.{format} are generated next to it, and
+the markdown image is rewritten to an include of _includes/post-image.html,
+which renders a <picture> with srcset pointing at the local variants.
+
+images/posts/manifest.json maps each source URL to its stored image and
+variants, so re-runs fetch nothing and only build variants that are
+missing. The original URL stays in the rewritten post (as `origin`), so
+image_insertion.py still sees the image as present.
+
+Run from the repository root:
+
+    python image_mirror.py                         # fetch over HTTP
+    python image_mirror.py --source-dir ~/img      # offline, from a local copy
+"""
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from image_insertion import write_if_changed
+
+try:
+    from PIL import Image, features
+except ImportError:  # Originals are still mirrored, just without variants
+    Image = features = None
+
+STORE_DIR = 'images/posts'
+MANIFEST_FILE = 'manifest.json'
+HOSTS = ('notion-lgd.oss-cn-beijing.aliyuncs.com', 'raw.githubusercontent.com')
+WIDTHS = (480, 960, 1600)
+FORMATS = ('avif', 'webp')
+QUALITY = {'webp': 80, 'avif': 60}
+TIMEOUT = 30
+RETRIES = 3
+WORKERS = 8
+USER_AGENT = 'academicpages-image-mirror'
+
+MARKDOWN_IMAGE = re.compile(r'!\[([^\]\n]*)\]\(\s*<?(https?://[^)\s>]+)>?\s*\)')
+# Images already rewritten by an earlier run, so new settings reach them too
+INCLUDE_IMAGE = re.compile(r'\{% include post-image\.html [^%\n]*? alt="([^"\n]*)" origin="([^"\s]+)" %\}')
+# The same, as written without Pillow: a plain link to the stored original
+LOCAL_IMAGE = re.compile(r'!\[([^\]\n]*)\]\(\{\{ "/images/posts/[^"\n]*" \| relative_url \}\}\)<!-- origin: (\S+) -->')
+IMAGE_PATTERNS = (MARKDOWN_IMAGE, INCLUDE_IMAGE, LOCAL_IMAGE)
+
+
+class HttpSource:
+    """Fetch images over HTTP with retries and exponential backoff."""
+
+    def __init__(self, timeout=TIMEOUT, retries=RETRIES, user_agent=USER_AGENT):
+        self.timeout = timeout
+        self.retries = retries
+        self.user_agent = user_agent
+
+    def fetch(self, url):
+        request = urllib.request.Request(url, headers={'User-Agent': self.user_agent})
+        for attempt in range(self.retries):
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return response.read()
+            except urllib.error.HTTPError as e:
+                if e.code < 500 and e.code != 429 or attempt == self.retries - 1:
+                    raise
+            except (urllib.error.URLError, TimeoutError):
+                if attempt == self.retries - 1:
+                    raise
+            time.sleep(2 ** attempt)
+
+
+class DirectorySource:
+    """Read images from a local directory instead of the network.
+
+    A URL is looked up as {dir}/{host}/{path} first and then by its file
+    name alone, so both a full mirror and a flat folder of downloads work.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self, url):
+        parts = urllib.parse.urlsplit(url)
+        path = urllib.parse.unquote(parts.path).lstrip('/')
+        for candidate in (os.path.join(self.path, parts.netloc, path),
+                          os.path.join(self.path, os.path.basename(path))):
+            if os.path.isfile(candidate):
+                with open(candidate, 'rb') as f:
+                    return f.read()
+        raise FileNotFoundError(f'{url} not found in {self.path}')
+
+
+def load_manifest(store):
+    """Return the URL -> stored image mapping of the store, or {}."""
+    try:
+        with open(os.path.join(store, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f).get('images', {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(store, images):
+    """Write the manifest, sorted so unchanged runs leave it untouched."""
+    text = json.dumps({'version': 1, 'images': images}, indent=2, sort_keys=True, ensure_ascii=False) + '\n'
+    return write_if_changed(os.path.join(store, MANIFEST_FILE), text)
+
+
+def find_image_urls(posts, hosts=HOSTS):
+    """Return the sorted remote image URLs on the given hosts used by posts."""
+    urls = set()
+    for post in posts:
+        with open(post, 'r', encoding='utf-8') as f:
+            text = f.read()
+        for pattern in IMAGE_PATTERNS:
+            for match in pattern.finditer(text):
+                if urllib.parse.urlsplit(match.group(2)).netloc in hosts:
+                    urls.add(match.group(2))
+    return sorted(urls)
+
+
+def image_extension(data, url):
+    """Extension of the image data, sniffed by Pillow when available."""
+    if Image is not None:
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                fmt = image.format.lower()
+            return 'jpg' if fmt == 'jpeg' else fmt
+        except Exception:
+            pass
+    ext = os.path.splitext(urllib.parse.urlsplit(url).path)[1].lstrip('.').lower()
+    return ext or 'bin'
+
+
+def store_original(data, url, store):
+    """Write data into the content-addressed store; return its manifest entry."""
+    name = hashlib.sha256(data).hexdigest()[:16]
+    ext = image_extension(data, url)
+    path = os.path.join(store, f'{name}.{ext}')
+    if not os.path.exists(path):
+        # Several URLs may hold the same image, so every writer gets its own temporary file
+        fd, tmp_path = tempfile.mkstemp(dir=store, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    return {'name': name, 'ext': ext}
+
+
+def supported_formats(formats):
+    """The requested variant formats this Pillow build can encode."""
+    if features is None:
+        return []
+    return [fmt for fmt in formats if features.check(fmt)]
+
+
+def variant_widths(width, widths):
+    """Target widths no larger than the original, always including it."""
+    return sorted({w for w in widths if w < width} | {width})
+
+
+def variants_complete(entry, store, widths, formats):
+    """True if every variant the settings call for already exists."""
+    if 'width' not in entry:
+        return not formats
+    expected = variant_widths(entry['width'], widths)
+    return (entry.get('variants') == {fmt: expected for fmt in formats}
+            and all(os.path.exists(os.path.join(store, f"{entry['name']}-{w}.{fmt}"))
+                    for fmt in formats for w in expected))
+
+
+def build_variants(args):
+    """Generate the resized variants of one stored image.
+
+    Returns the entry updated with the image size and the widths written
+    per format. Runs in a worker process.
+    """
+    entry, store, widths, formats = args
+    entry = dict(entry)
+    with Image.open(os.path.join(store, f"{entry['name']}.{entry['ext']}")) as image:
+        image.load()
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+        entry['width'], entry['height'] = image.size
+        targets = variant_widths(image.width, widths)
+        for w in targets:
+            resized = image if w == image.width else image.resize(
+                (w, max(1, round(image.height * w / image.width))), Image.LANCZOS)
+            for fmt in formats:
+                path = os.path.join(store, f"{entry['name']}-{w}.{fmt}")
+                if not os.path.exists(path):
+                    fd, tmp_path = tempfile.mkstemp(dir=store, prefix='.', suffix='.tmp')
+                    try:
+                        with os.fdopen(fd, 'wb') as f:
+                            resized.save(f, format=fmt.upper(), quality=QUALITY.get(fmt, 80))
+                        os.replace(tmp_path, path)
+                    except BaseException:
+                        os.unlink(tmp_path)
+                        raise
+    entry['variants'] = {fmt: targets for fmt in formats}
+    return entry
+
+
+def include_tag(alt, url, entry):
+    """The post-image.html include that replaces a markdown image."""
+    variants = entry.get('variants') or {}
+    widths = next(iter(variants.values()), [])
+    alt = alt.replace('"', '&quot;')
+    if not variants:
+        return f'![{alt}]({{{{ "/images/posts/{entry["name"]}.{entry["ext"]}" | relative_url }}}})<!-- origin: {url} -->'
+    return ('{% include post-image.html'
+            f' name="{entry["name"]}" ext="{entry["ext"]}" width="{entry["width"]}"'
+            f' widths="{",".join(map(str, widths))}" formats="{",".join(variants)}"'
+            f' alt="{alt}" origin="{url}" %}}')
+
+
+def rewrite_post(post, images):
+    """Replace mirrored markdown images in post; True if it was rewritten."""
+    with open(post, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+
+    def replace(match):
+        entry = images.get(match.group(2))
+        return include_tag(match.group(1), match.group(2), entry) if entry else match.group(0)
+
+    for pattern in IMAGE_PATTERNS:
+        text = pattern.sub(replace, text)
+    return write_if_changed(post, text)
+
+
+def fetch_images(urls, source, store, workers=WORKERS):
+    """Download urls concurrently into the store.
+
+    Returns (entries, failures): URL -> manifest entry, and URL -> error.
+    """
+    entries, failures = {}, {}
+
+    def fetch(url):
+        return url, store_original(source.fetch(url), url, store)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fetch, url) for url in urls]
+        for url, future in zip(urls, futures):
+            try:
+                entries[url] = future.result()[1]
+            except Exception as e:
+                failures[url] = e
+    return entries, failures
+
+
+def mirror_images(posts, source, store=STORE_DIR, hosts=HOSTS, widths=WIDTHS, formats=FORMATS,
+                  workers=WORKERS, jobs=1, rewrite=True):
+    """Mirror the images of posts and rewrite them to local variants.
+
+    Returns a dict of counts ("fetched", "cached", "variants", "rewritten")
+    and the "failures" mapping URL -> error.
+    """
+    os.makedirs(store, exist_ok=True)
+    images = load_manifest(store)
+    urls = find_image_urls(posts, hosts)
+
+    # Only URLs without a stored original are fetched
+    cached = [url for url in urls if url in images
+              and os.path.exists(os.path.join(store, f"{images[url]['name']}.{images[url]['ext']}"))]
+    missing = [url for url in urls if url not in cached]
+    fetched, failures = fetch_images(missing, source, store, workers)
+    images.update(fetched)
+
+    formats = supported_formats(formats)
+    stale = [url for url in urls if url in images and not variants_complete(images[url], store, widths, formats)]
+    if formats and stale:
+        tasks = [(images[url], store, widths, formats) for url in stale]
+        if jobs == 1 or len(tasks) < 2:
+            results = map(build_variants, tasks)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(build_variants, tasks))
+        images.update(zip(stale, results))
+    save_manifest(store, images)
+
+    rewritten = sum(rewrite_post(post, images) for post in posts) if rewrite else 0
+    return {'fetched': len(fetched), 'cached': len(cached), 'variants': len(stale) if formats else 0,
+            'rewritten': rewritten, 'failures': failures}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Mirror remote post images locally as responsive variants')
+    parser.add_argument('posts', nargs='*', help='Posts to process (default: _posts/*.md)')
+    parser.add_argument('--store', default=STORE_DIR, help=f'Local image store (default: {STORE_DIR})')
+    parser.add_argument('--source-dir', help='Read images from this directory instead of downloading them')
+    parser.add_argument('--host', action='append', dest='hosts',
+                        help=f'Image host to mirror, repeatable (default: {", ".join(HOSTS)})')
+    parser.add_argument('--widths', default=','.join(map(str, WIDTHS)),
+                        help='Comma separated variant widths in pixels')
+    parser.add_argument('--formats', default=','.join(FORMATS),
+                        help='Comma separated variant formats (webp, avif)')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help='HTTP timeout in seconds')
+    parser.add_argument('--workers', type=int, default=WORKERS, help='Concurrent downloads')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='Processes building variants (default: 0, one per CPU)')
+    parser.add_argument('--no-rewrite', action='store_true', help='Mirror images without touching the posts')
+    args = parser.parse_args(argv)
+
+    posts = args.posts or sorted(glob.glob('_posts/*.md'))
+    source = DirectorySource(args.source_dir) if args.source_dir else HttpSource(args.timeout)
+    widths = [int(w) for w in args.widths.split(',') if w]
+    formats = [fmt.strip().lower() for fmt in args.formats.split(',') if fmt.strip()]
+    unsupported = set(formats) - set(supported_formats(formats))
+    if unsupported:
+        print(f'Skipping variant formats this Pillow build cannot write: {", ".join(sorted(unsupported))}')
+
+    result = mirror_images(posts, source, args.store, tuple(args.hosts or HOSTS), widths, formats,
+                           args.workers, args.jobs or os.cpu_count() or 1, not args.no_rewrite)
+    print(f"Fetched {result['fetched']} images ({result['cached']} cached), "
+          f"built variants for {result['variants']}, rewrote {result['rewritten']} posts")
+    for url, error in sorted(result['failures'].items()):
+        print(f'  Failed to fetch {url}: {error}')
+    return 1 if result['failures'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,218 @@
+# coding: utf-8
+
+# # Near-duplicate detection for the publication generators
+#
+# The same paper imported twice, e.g. from two `.bib` files with a slightly different title or date, gets two filenames and so two pages in `_publications`. `find_duplicates` groups such records in roughly linear time instead of comparing every pair:
+#
+# - each title is normalized (accents, case, LaTeX braces and punctuation dropped) and cut into character trigrams,
+# - a MinHash signature of NUM_PERMUTATIONS values is computed from the trigrams and split into BANDS bands; records sharing any band, or sharing a DOI, become candidates,
+# - candidates are confirmed by the exact trigram Jaccard similarity of their titles (at least TITLE_THRESHOLD), the same numbers in the title (so "Part 1" and "Part 2" stay apart), years at most a year apart and overlapping author surnames, when both records have them.
+#
+# Records with the same DOI are always duplicates. `pubsFromBib.py` and `publications.py` run this over their input with `--dedup flag` (the default, only reports) or `--dedup merge` (keeps the most complete record of each group). Run this file directly to check pages that are already in `_publications`:
+#
+#     python dedup.py ../_publications
+
+import argparse
+import glob
+import os
+import random
+import re
+import unicodedata
+import zlib
+from collections import namedtuple
+
+# key identifies the record (e.g. its page filename); score ranks records for merging
+Record = namedtuple("Record", ["key", "title", "doi", "authors", "year", "score"])
+
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 32
+BANDS = 8
+TITLE_THRESHOLD = 0.8
+AUTHOR_THRESHOLD = 0.5
+
+# Universal hash functions (a * x + b) mod p, fixed so signatures are stable between runs
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240101)
+PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+DOI_PREFIX = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+
+def normalize_text(text):
+    """Lowercase text and reduce it to ASCII letters, digits and single spaces."""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"\\[a-zA-Z]+|[{}\\]", "", text).lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+def normalize_doi(doi):
+    """Return a DOI without resolver prefix, lowercased, or "" if there is none."""
+    doi = DOI_PREFIX.sub("", str(doi or "").strip())
+    return doi.lower() if doi.startswith("10.") else ""
+
+
+def shingles(title):
+    """Return the set of character trigrams of a normalized title."""
+    text = f" {title} "
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(grams, table):
+    """MinHash signature of a non-empty set of trigrams.
+
+    table caches the hash values of every trigram under all permutations;
+    titles share most of their trigrams, so the signature is then mostly
+    the column minima of cached rows.
+    """
+    rows = []
+    for gram in grams:
+        row = table.get(gram)
+        if row is None:
+            h = zlib.crc32(gram.encode())
+            row = table[gram] = tuple((a * h + b) % _PRIME for a, b in PERMUTATIONS)
+        rows.append(row)
+    return list(map(min, zip(*rows)))
+
+
+def band_keys(signature):
+    """Split a signature into the LSH bucket keys of its bands."""
+    rows = NUM_PERMUTATIONS // BANDS
+    return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(BANDS)]
+
+
+def jaccard(a, b):
+    """Jaccard similarity of two sets."""
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def is_duplicate(a, b, shingles_a, shingles_b):
+    """Decide whether two candidate records describe the same publication."""
+    if a.doi and a.doi == b.doi:
+        return True
+    if jaccard(shingles_a, shingles_b) < TITLE_THRESHOLD:
+        return False
+    if re.findall(r"\d+", a.title) != re.findall(r"\d+", b.title):
+        return False
+    if a.year and b.year and abs(a.year - b.year) > 1:
+        return False
+    if a.authors and b.authors:
+        overlap = len(set(a.authors) & set(b.authors)) / min(len(set(a.authors)), len(set(b.authors)))
+        if overlap < AUTHOR_THRESHOLD:
+            return False
+    return True
+
+
+def find_duplicates(records):
+    """Group near-duplicate records.
+
+    Titles must already be normalized (see make_record). Returns a list of
+    groups of record indices, each sorted and with at least two members,
+    ordered by their first index.
+    """
+    parent = list(range(len(records)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    table = {}
+    record_shingles = []
+    for i, record in enumerate(records):
+        grams = shingles(record.title) if record.title else set()
+        record_shingles.append(grams)
+
+        keys = [("doi", record.doi)] if record.doi else []
+        if grams:
+            keys += band_keys(minhash(grams, table))
+
+        candidates = set()
+        for key in keys:
+            bucket = buckets.setdefault(key, [])
+            candidates.update(bucket)
+            bucket.append(i)
+
+        for j in sorted(candidates):
+            if find(i) != find(j) and is_duplicate(records[j], record, record_shingles[j], grams):
+                parent[find(i)] = find(j)
+
+    groups = {}
+    for i in range(len(records)):
+        groups.setdefault(find(i), []).append(i)
+    return sorted((group for group in groups.values() if len(group) > 1), key=lambda group: group[0])
+
+
+def make_record(key, title, doi="", authors=(), year=None, score=0):
+    """Build a Record, normalizing title, DOI and author surnames."""
+    year = str(year or "")[:4]
+    authors = tuple(filter(None, (normalize_text(author) for author in authors)))
+    return Record(key, normalize_text(title), normalize_doi(doi), authors,
+                  int(year) if year.isdigit() else None, score)
+
+
+def duplicates_to_drop(records, groups):
+    """Indices of the records --dedup merge drops: all but the best-scored of each group."""
+    drop = set()
+    for group in groups:
+        keep = max(group, key=lambda i: (records[i].score, -i))
+        drop.update(i for i in group if i != keep)
+    return drop
+
+
+def print_duplicates(records, groups, dropped=()):
+    """Print each group of duplicates, marking the records that are dropped."""
+    for group in groups:
+        print("WARNING Possible duplicate publications:")
+        for i in group:
+            print(f"  {'dropped' if i in dropped else 'kept   '} {records[i].key}")
+
+
+def dedup(records, mode):
+    """Report duplicate records, returning the set of indices to drop.
+
+    mode is "off" (nothing is checked), "flag" (duplicates are only
+    reported) or "merge" (all but the best-scored record of each group are
+    dropped).
+    """
+    if mode == "off":
+        return set()
+    groups = find_duplicates(records)
+    dropped = duplicates_to_drop(records, groups) if mode == "merge" else set()
+    print_duplicates(records, groups, dropped)
+    return dropped
+
+
+def front_matter(md_file):
+    """Read the YAML front matter of a page."""
+    # Only the command line needs PyYAML, which pybtex already depends on
+    import yaml
+
+    with open(md_file, "r", encoding="utf-8") as f:
+        text = f.read()
+    match = re.match(r"---\s*\n(.*?)\n---", text, re.DOTALL)
+    return (yaml.safe_load(match.group(1)) if match else None) or {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report near-duplicate pages in a publications directory")
+    parser.add_argument("directory", nargs="?", default="../_publications/", help="Publications directory")
+    args = parser.parse_args(argv)
+
+    records = []
+    for md_file in sorted(glob.glob(os.path.join(args.directory, "*.md"))):
+        page = front_matter(md_file)
+        doi = page.get("doi") or page.get("paperurl") or ""
+        records.append(make_record(os.path.basename(md_file), page.get("title"), doi,
+                                   year=str(page.get("date") or "")[:4]))
+
+    groups = find_duplicates(records)
+    print_duplicates(records, groups)
+    print(f"{args.directory}: {len(records)} pages, {len(groups)} groups of possible duplicates")
+    raise SystemExit(1 if groups else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# coding: utf-8
+
+# # Page writer shared by the markdown generators
+#
+# `pubsFromBib.py`, `publications.py` and `talks.py` hand their generated pages to `write_pages`. A page is only written when its content differs from what is already on disk, and then atomically through a temporary file, so unchanged entries keep their mtimes and `jekyll build --incremental` only regenerates pages that really changed.
+#
+# Files in the output directory that the run did not produce are reported as orphaned, but never deleted, since they may have been written by hand or by another generator.
+
+import glob
+import os
+import tempfile
+
+
+def write_if_changed(path, text):
+    """Atomically write text to path unless it already holds it.
+
+    Returns "created", "updated" or "unchanged".
+    """
+    status = "created"
+    if os.path.exists(path):
+        with open(path, 'r', encoding="utf-8") as f:
+            if f.read() == text:
+                return "unchanged"
+        status = "updated"
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return status
+
+
+def write_pages(pages, output_dir):
+    """Write an iterable of (md_filename, markdown) pages into output_dir.
+
+    Pages are written as they are produced, so pages may be a generator
+    and only one page needs to be held in memory at a time. Returns a dict
+    with the number of "created", "updated" and "unchanged" pages and the
+    sorted list of "orphaned" filenames.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    summary = {"created": 0, "updated": 0, "unchanged": 0}
+    orphaned = {os.path.basename(path) for path in glob.glob(os.path.join(output_dir, "*.md"))}
+
+    for md_filename, md in pages:
+        md_filename = os.path.basename(md_filename)
+        summary[write_if_changed(os.path.join(output_dir, md_filename), md)] += 1
+        orphaned.discard(md_filename)
+
+    summary["orphaned"] = sorted(orphaned)
+    return summary
+
+
+def print_summary(summary, output_dir):
+    """Print the counts of a write_pages summary, listing orphaned files."""
+    counts = ", ".join(f"{summary[status]} {status}" for status in ("created", "updated", "unchanged"))
+    counts += f", {len(summary['orphaned'])} orphaned"
+    print(f"{output_dir}: {counts}")
+    for md_filename in summary["orphaned"]:
+        print(f"  orphaned: {md_filename}")
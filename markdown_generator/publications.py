@@ -32,10 +32,21 @@ import pandas as pd
 # 
 # I found it important to put this data in a tab-separated values format, because there are a lot of commas in this kind of data and comma-separated values can get messed up. However, you can modify the import statement, as pandas also has read_excel(), read_json(), and others.
 
+# The TSV is read in chunks of `--chunksize` rows and pages are written as each chunk is rendered, so memory use stays bounded however large the TSV is. Pass another TSV and output directory on the command line to use something other than `publications.tsv` and `../_publications/`.
+
 # In[3]:
 
-publications = pd.read_csv("publications.tsv", sep="\t", header=0)
-publications
+import argparse
+
+parser = argparse.ArgumentParser(description="Convert a TSV of publications to markdown pages")
+parser.add_argument("input", nargs="?", default="publications.tsv", help="TSV file (default: publications.tsv)")
+parser.add_argument("--output", "-o", default="../_publications/", help="Output directory (default: ../_publications/)")
+parser.add_argument("--chunksize", type=int, default=10000, help="Rows per chunk (0 = read the whole TSV at once)")
+parser.add_argument("--dedup", choices=["off", "flag", "merge"], default="flag",
+                    help="Report near-duplicate rows (flag), keep only the most complete one (merge) or skip the check (off)")
+args = parser.parse_args()
+
+publications = pd.read_csv(args.input, sep="\t", header=0, chunksize=args.chunksize or None)
 
 
 # ## Escape special characters
@@ -50,60 +61,94 @@ html_escape_table = {
     "'": "&apos;"
     }
 
-def html_escape(text):
-    """Produce entities within text."""
-    return "".join(html_escape_table.get(c,c) for c in text)
+html_escape_translation = str.maketrans(html_escape_table)
 
+def html_escape_column(column):
+    """Produce entities within every value of a column at once."""
+    return column.astype(str).str.translate(html_escape_translation)
 
-# ## Creating the markdown files
+
+# ## Finding duplicates
 # 
-# This is where the heavy lifting is done. This loops through all the rows in the TSV dataframe, then starts to concatentate a big string (```md```) that contains the markdown for each type. It does the YAML metadata first, then does the description for the individual page. If you don't want something to appear (like the "Recommended citation")
+# The same paper can end up in the TSV twice with a slightly different title or date, which would give it two pages. Before rendering, a first pass over the TSV reads only the columns needed to find near-duplicate rows (see dedup.py); they are reported, or with `--dedup merge` all but the most complete row of each group are skipped. Rows keep their position in the TSV as their index across chunks, so the skipped rows can be dropped from each chunk while rendering.
 
 # In[5]:
 
-import os
-for row, item in publications.iterrows():
-    
-    md_filename = str(item.pub_date) + "-" + item.url_slug + ".md"
-    html_filename = str(item.pub_date) + "-" + item.url_slug
-    year = item.pub_date[:4]
-    
-    ## YAML variables
-    
-    md = "---\ntitle: \""   + item.title + '"\n'
-
-    # TODO Update to use the category assigned in the TSV file
-    md += """collection: manuscripts"""
-    
-    md += """\npermalink: /publication/""" + html_filename
-    
-    if len(str(item.excerpt)) > 5:
-        md += "\nexcerpt: '" + html_escape(item.excerpt) + "'"
-    
-    md += "\ndate: " + str(item.pub_date) 
-    
-    md += "\nvenue: '" + html_escape(item.venue) + "'"
-    
-    if len(str(item.paper_url)) > 5:
-        md += "\npaperurl: '" + item.paper_url + "'"
-    
-    md += "\ncitation: '" + html_escape(item.citation) + "'"
-    
-    md += "\n---"
-    
-    ## Markdown description for individual page
-    
-    if len(str(item.paper_url)) > 5:
-        md += "\n\n<a href='" + item.paper_url + "'>Download paper here</a>\n" 
-        
-    if len(str(item.excerpt)) > 5:
-        md += "\n" + html_escape(item.excerpt) + "\n"
-        
-    md += "\nRecommended citation: " + item.citation
-    
-    md_filename = os.path.basename(md_filename)
-       
-    with open("../_publications/" + md_filename, 'w') as f:
-        f.write(md)
+from dedup import dedup, make_record
+
+def dedup_records(publications):
+    """Describe every row of a publications dataframe for duplicate detection."""
+    # Empty TSV cells are read as NaN, so the filled cells count how complete a row is
+    filled = publications.notna()
+    return [
+        make_record(f"{pub_date}-{url_slug}.md", title, paper_url, year=pub_date, score=score)
+        for pub_date, url_slug, title, paper_url, score in zip(
+            publications.pub_date.astype(str), publications.url_slug.astype(str), publications.title.astype(str),
+            publications.paper_url.fillna("").astype(str), filled.sum(axis=1))
+    ]
+
+dropped = set()
+if args.dedup != "off":
+    rows = pd.read_csv(args.input, sep="\t", header=0, chunksize=args.chunksize or None)
+    rows = rows if args.chunksize else [rows]
+    records = [record for chunk in rows for record in dedup_records(chunk)]
+    dropped = dedup(records, args.dedup)
+
+
+# ## Creating the markdown files
+# 
+# This is where the heavy lifting is done. Rather than looping through the rows of the TSV dataframe, each column is prepared at once with pandas string operations: values are escaped, and the optional YAML fields and page sections are filled in or left blank depending on whether the row has an excerpt or paper URL. Every page is then rendered through the single template below, which does the YAML metadata first, then the description for the individual page. If you don't want something to appear (like the "Recommended citation"), remove it from the template.
+
+# In[6]:
+
+from page_writer import print_summary, write_pages
+
+# TODO Update to use the category assigned in the TSV file
+page_template = (
+    '---\ntitle: "{title}"\n'
+    'collection: manuscripts'
+    '\npermalink: /publication/{html_filename}'
+    '{yaml_excerpt}'
+    '\ndate: {pub_date}'
+    "\nvenue: '{venue}'"
+    '{yaml_paper_url}'
+    "\ncitation: '{escaped_citation}'"
+    '\n---'
+    '{paper_link}'
+    '{excerpt}'
+    '\nRecommended citation: {citation}'
+)
+
+def render_pages(publications):
+    """Render every row of a publications dataframe as (md_filename, markdown)."""
+    pub_date = publications.pub_date.astype(str)
+    html_filename = pub_date + "-" + publications.url_slug.astype(str)
+    has_excerpt = publications.excerpt.astype(str).str.len() > 5
+    has_paper_url = publications.paper_url.astype(str).str.len() > 5
+    excerpt = html_escape_column(publications.excerpt)
+    paper_url = publications.paper_url.astype(str)
+
+    columns = {
+        "title": publications.title.astype(str),
+        "html_filename": html_filename,
+        "yaml_excerpt": ("\nexcerpt: '" + excerpt + "'").where(has_excerpt, ""),
+        "pub_date": pub_date,
+        "venue": html_escape_column(publications.venue),
+        "yaml_paper_url": ("\npaperurl: '" + paper_url + "'").where(has_paper_url, ""),
+        "escaped_citation": html_escape_column(publications.citation),
+        "paper_link": ("\n\n<a href='" + paper_url + "'>Download paper here</a>\n").where(has_paper_url, ""),
+        "excerpt": ("\n" + excerpt + "\n").where(has_excerpt, ""),
+        "citation": publications.citation.astype(str),
+    }
+
+    names = list(columns)
+    pages = [page_template.format(**dict(zip(names, values))) for values in zip(*columns.values())]
+    return list(zip(html_filename + ".md", pages))
+
+
+# Pages are only written if their content changed, see page_writer.py
+chunks = publications if args.chunksize else [publications]
+pages = (page for chunk in chunks for page in render_pages(chunk[~chunk.index.isin(dropped)]))
+print_summary(write_pages(pages, args.output), args.output)
 
 
@@ -12,17 +12,37 @@
 # * any specific pre-text for specific files
 # * Collection Name (future feature)
 # 
+# Or pass any number of .bib files and glob patterns on the command line, e.g.
+# 
+#     python pubsFromBib.py --output ../_publications --jobs 4 "dumps/*.bib" extra.bib
+# 
+# Each entry then uses the "proceeding" or "journal" settings from publist
+# depending on its BibTeX type, unless --type picks one for all of them. Files
+# are parsed in parallel across --jobs processes and all pages are written
+# by a single batched writer at the end, which skips pages whose content is
+# unchanged (see page_writer.py). The same engine can be used as a
+# library through generate_publications().
+#
+# Before writing, entries are checked for near-duplicates across all files
+# (see dedup.py): by default they are reported, --dedup merge keeps only the
+# most complete entry of each group and --dedup off skips the check.
+# 
 # TODO: Make this work with other databases of citations, 
 # TODO: Merge this with the existing TSV parsing solution
 
 
-from pybtex.database.input import bibtex
-import pybtex.database.input.bibtex 
-from time import strptime
-import string
+import argparse
+import glob
 import html
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from time import strptime
+
+from pybtex.database.input import bibtex
+
+from dedup import dedup, make_record
+from page_writer import print_summary, write_pages
 
 #todo: incorporate different collection types rather than a catch all publications, requires other changes to template
 publist = {
@@ -43,118 +63,221 @@ publist = {
     } 
 }
 
+# BibTeX entry types that take the "proceeding" settings when --type is not given
+PROCEEDING_TYPES = {"inproceedings", "conference", "proceedings"}
+
 html_escape_table = {
     "&": "&amp;",
     '"': "&quot;",
     "'": "&apos;"
     }
+html_escape_translation = str.maketrans(html_escape_table)
 
 def html_escape(text):
     """Produce entities within text."""
-    return "".join(html_escape_table.get(c,c) for c in text)
+    return text.translate(html_escape_translation)
+
+
+def strip_braces(text):
+    """Strip out {} and \\ as needed (some bibtex entries that maintain formatting)."""
+    return text.replace("{", "").replace("}","").replace("\\","")
+
+
+def publication_date(b):
+    """Build the YYYY-MM-DD date of an entry, defaulting month and day to 01."""
+    pub_year = f'{b["year"]}'
+    pub_month = "01"
+    pub_day = "01"
+
+    #todo: this hack for month and day needs some cleanup
+    if "month" in b.keys(): 
+        if(len(b["month"])<3):
+            pub_month = "0"+b["month"]
+            pub_month = pub_month[-2:]
+        elif(b["month"] not in range(12)):
+            tmnth = strptime(b["month"][:3],'%b').tm_mon   
+            pub_month = "{:02d}".format(tmnth) 
+        else:
+            pub_month = str(b["month"])
+    if "day" in b.keys(): 
+        pub_day = str(b["day"])
+
+    return pub_year, pub_year+"-"+pub_month+"-"+pub_day
+
+
+def render_publication(entry, source):
+    """Render one bibtex entry as (md_filename, markdown).
+
+    Raises KeyError if a field the page needs is missing.
+    """
+    b = entry.fields
+    pub_year, pub_date = publication_date(b)
+
+    clean_title = strip_braces(b["title"]).replace(" ","-")
+
+    url_slug = re.sub("\\[.*\\]|[^a-zA-Z0-9_-]", "", clean_title)
+    url_slug = url_slug.replace("--","-")
+
+    md_filename = (pub_date + "-" + url_slug + ".md").replace("--","-")
+    html_filename = (pub_date + "-" + url_slug).replace("--","-")
+
+    title = html_escape(strip_braces(b["title"]))
+
+    #add venue logic depending on citation type
+    venue = source["venue-pretext"] + strip_braces(b[source["venuekey"]])
+
+    #Build Citation from text
+    #citation authors - todo - add highlighting for primary author?
+    authors = "".join(" "+author.first_names[0]+" "+author.last_names[0]+", "
+                      for author in entry.persons["author"])
+    citation = f'{authors}"{title}." {html_escape(venue)}, {pub_year}.'
+
+    note = "note" in b.keys() and len(str(b["note"])) > 5
+    url = "url" in b.keys() and len(str(b["url"])) > 5
+
+    ## YAML variables
+    md = [
+        f'---\ntitle: "{title}"\n',
+        f'collection: {source["collection"]["name"]}',
+        f'\npermalink: {source["collection"]["permalink"]}{html_filename}',
+    ]
+    if note:
+        md.append(f"\nexcerpt: '{html_escape(b['note'])}'")
+    md.append(f"\ndate: {pub_date}")
+    md.append(f"\nvenue: '{html_escape(venue)}'")
+    if url:
+        md.append(f"\npaperurl: '{b['url']}'")
+    md.append(f"\ncitation: '{html_escape(citation)}'")
+    md.append("\n---")
+
+    ## Markdown description for individual page
+    if note:
+        md.append(f"\n{html_escape(b['note'])}\n")
+    if url:
+        md.append(f"\n[Access paper here]({b['url']}){{:target=\"_blank\"}}\n")
+    else:
+        scholar_query = html.escape(clean_title.replace("-","+"))
+        md.append(f"\nUse [Google Scholar](https://scholar.google.com/scholar?q={scholar_query}){{:target=\"_blank\"}} for full citation")
 
+    return os.path.basename(md_filename), "".join(md)
 
-for pubsource in publist:
+
+def dedup_record(md_filename, entry):
+    """Describe a rendered entry for duplicate detection; richer entries score higher."""
+    b = entry.fields
+    authors = [author.last_names[0] for author in entry.persons.get("author", []) if author.last_names]
+    return make_record(md_filename, strip_braces(b["title"]), b.get("doi", ""), authors, b.get("year"), len(b))
+
+
+def parse_bib_file(path, source=None):
+    """Parse one .bib file into rendered pages.
+
+    Returns (pages, records, messages): a list of (md_filename, markdown),
+    the dedup record of each page and the status line of each entry.
+    Without a source, each entry picks the publist settings that match its
+    BibTeX type.
+    """
     parser = bibtex.Parser()
-    bibdata = parser.parse_file(publist[pubsource]["file"])
+    bibdata = parser.parse_file(path)
 
+    pages = []
+    records = []
+    messages = []
     #loop through the individual references in a given bibtex file
-    for bib_id in bibdata.entries:
-        #reset default date
-        pub_year = "1900"
-        pub_month = "01"
-        pub_day = "01"
-        
-        b = bibdata.entries[bib_id].fields
-        
+    for bib_id, entry in bibdata.entries.items():
+        title = entry.fields.get("title", "")
+        entry_source = source or publist["proceeding" if entry.type.lower() in PROCEEDING_TYPES else "journal"]
         try:
-            pub_year = f'{b["year"]}'
-
-            #todo: this hack for month and day needs some cleanup
-            if "month" in b.keys(): 
-                if(len(b["month"])<3):
-                    pub_month = "0"+b["month"]
-                    pub_month = pub_month[-2:]
-                elif(b["month"] not in range(12)):
-                    tmnth = strptime(b["month"][:3],'%b').tm_mon   
-                    pub_month = "{:02d}".format(tmnth) 
-                else:
-                    pub_month = str(b["month"])
-            if "day" in b.keys(): 
-                pub_day = str(b["day"])
-
-                
-            pub_date = pub_year+"-"+pub_month+"-"+pub_day
-            
-            #strip out {} as needed (some bibtex entries that maintain formatting)
-            clean_title = b["title"].replace("{", "").replace("}","").replace("\\","").replace(" ","-")    
-
-            url_slug = re.sub("\\[.*\\]|[^a-zA-Z0-9_-]", "", clean_title)
-            url_slug = url_slug.replace("--","-")
-
-            md_filename = (str(pub_date) + "-" + url_slug + ".md").replace("--","-")
-            html_filename = (str(pub_date) + "-" + url_slug).replace("--","-")
-
-            #Build Citation from text
-            citation = ""
-
-            #citation authors - todo - add highlighting for primary author?
-            for author in bibdata.entries[bib_id].persons["author"]:
-                citation = citation+" "+author.first_names[0]+" "+author.last_names[0]+", "
-
-            #citation title
-            citation = citation + "\"" + html_escape(b["title"].replace("{", "").replace("}","").replace("\\","")) + ".\""
-
-            #add venue logic depending on citation type
-            venue = publist[pubsource]["venue-pretext"]+b[publist[pubsource]["venuekey"]].replace("{", "").replace("}","").replace("\\","")
-
-            citation = citation + " " + html_escape(venue)
-            citation = citation + ", " + pub_year + "."
-
-            
-            ## YAML variables
-            md = "---\ntitle: \""   + html_escape(b["title"].replace("{", "").replace("}","").replace("\\","")) + '"\n'
-            
-            md += """collection: """ +  publist[pubsource]["collection"]["name"]
-
-            md += """\npermalink: """ + publist[pubsource]["collection"]["permalink"]  + html_filename
-            
-            note = False
-            if "note" in b.keys():
-                if len(str(b["note"])) > 5:
-                    md += "\nexcerpt: '" + html_escape(b["note"]) + "'"
-                    note = True
-
-            md += "\ndate: " + str(pub_date) 
-
-            md += "\nvenue: '" + html_escape(venue) + "'"
-            
-            url = False
-            if "url" in b.keys():
-                if len(str(b["url"])) > 5:
-                    md += "\npaperurl: '" + b["url"] + "'"
-                    url = True
-
-            md += "\ncitation: '" + html_escape(citation) + "'"
-
-            md += "\n---"
-
-            
-            ## Markdown description for individual page
-            if note:
-                md += "\n" + html_escape(b["note"]) + "\n"
-
-            if url:
-                md += "\n[Access paper here](" + b["url"] + "){:target=\"_blank\"}\n" 
-            else:
-                md += "\nUse [Google Scholar](https://scholar.google.com/scholar?q="+html.escape(clean_title.replace("-","+"))+"){:target=\"_blank\"} for full citation"
-
-            md_filename = os.path.basename(md_filename)
-
-            with open("../_publications/" + md_filename, 'w', encoding="utf-8") as f:
-                f.write(md)
-            print(f'SUCCESSFULLY PARSED {bib_id}: \"', b["title"][:60],"..."*(len(b['title'])>60),"\"")
+            pages.append(render_publication(entry, entry_source))
+            records.append(dedup_record(pages[-1][0], entry))
+            messages.append(f'SUCCESSFULLY PARSED {bib_id}: " {title[:60]} {"..."*(len(title)>60)} "')
         # field may not exist for a reference
         except KeyError as e:
-            print(f'WARNING Missing Expected Field {e} from entry {bib_id}: \"', b["title"][:30],"..."*(len(b['title'])>30),"\"")
-            continue
+            messages.append(f'WARNING Missing Expected Field {e} from entry {bib_id}: " {title[:30]} {"..."*(len(title)>30)} "')
+    return pages, records, messages
+
+
+def _parse_bib_file(args):
+    return parse_bib_file(*args)
+
+
+def write_publications(pages, output_dir):
+    """Write all pages in one batch. Later pages win on filename clashes.
+
+    Unchanged pages are not rewritten; returns the write_pages summary.
+    """
+    return write_pages(dict(pages).items(), output_dir)
+
+
+def generate_publications(bib_files, output_dir, source=None, jobs=1, dedup_mode="flag"):
+    """Convert bib_files to publication pages in output_dir.
+
+    bib_files is a list of paths, or of (path, source) pairs to give files
+    their own publist settings. Files are parsed across jobs processes;
+    output order and contents do not depend on jobs. Near-duplicate entries
+    are handled according to dedup_mode ("off", "flag" or "merge", see
+    dedup.py). Returns the list of written filenames.
+    """
+    tasks = [item if isinstance(item, tuple) else (item, source) for item in bib_files]
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_parse_bib_file, tasks))
+    else:
+        results = [parse_bib_file(*task) for task in tasks]
+
+    pages = []
+    records = []
+    for file_pages, file_records, messages in results:
+        pages.extend(file_pages)
+        records.extend(file_records)
+        for message in messages:
+            print(message)
+
+    dropped = dedup(records, dedup_mode)
+    pages = [page for i, page in enumerate(pages) if i not in dropped]
+
+    print_summary(write_publications(pages, output_dir), output_dir)
+    return [md_filename for md_filename, _ in pages]
+
+
+def expand_bib_patterns(patterns):
+    """Expand files and glob patterns into a sorted, de-duplicated list of paths."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            print(f"WARNING No .bib files match {pattern}")
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert BibTeX files to academicpages publication pages")
+    parser.add_argument("bib", nargs="*",
+                        help=".bib files or glob patterns (default: the files listed in publist)")
+    parser.add_argument("--output", "-o", default="../_publications/", help="Output directory")
+    parser.add_argument("--type", choices=sorted(publist),
+                        help="Use these publist settings for every entry instead of picking by BibTeX type")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Parallel parser processes (0 = one per CPU)")
+    parser.add_argument("--dedup", choices=["off", "flag", "merge"], default="flag",
+                        help="Report near-duplicate entries (flag), keep only the most complete one (merge) "
+                             "or skip the check (off)")
+    args = parser.parse_args(argv)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    source = publist[args.type] if args.type else None
+
+    if args.bib:
+        bib_files = expand_bib_patterns(args.bib)
+    else:
+        bib_files = [(publist[pubsource]["file"], source or publist[pubsource]) for pubsource in publist]
+
+    generate_publications(bib_files, args.output, source=source, jobs=jobs, dedup_mode=args.dedup)
+
+
+if __name__ == "__main__":
+    main()
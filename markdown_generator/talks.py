@@ -10,7 +10,6 @@
 # In[1]:
 
 import pandas as pd
-import os
 
 
 # ## Data format
@@ -31,10 +30,19 @@ import os
 # 
 # I found it important to put this data in a tab-separated values format, because there are a lot of commas in this kind of data and comma-separated values can get messed up. However, you can modify the import statement, as pandas also has read_excel(), read_json(), and others.
 
+# The TSV is read in chunks of `--chunksize` rows and pages are written as each chunk is rendered, so memory use stays bounded however large the TSV is. Pass another TSV and output directory on the command line to use something other than `talks.tsv` and `../_talks/`.
+
 # In[3]:
 
-talks = pd.read_csv("talks.tsv", sep="\t", header=0)
-talks
+import argparse
+
+parser = argparse.ArgumentParser(description="Convert a TSV of talks to markdown pages")
+parser.add_argument("input", nargs="?", default="talks.tsv", help="TSV file (default: talks.tsv)")
+parser.add_argument("--output", "-o", default="../_talks/", help="Output directory (default: ../_talks/)")
+parser.add_argument("--chunksize", type=int, default=10000, help="Rows per chunk (0 = read the whole TSV at once)")
+args = parser.parse_args()
+
+talks = pd.read_csv(args.input, sep="\t", header=0, chunksize=args.chunksize or None)
 
 
 # ## Escape special characters
@@ -49,63 +57,65 @@ html_escape_table = {
     "'": "&apos;"
     }
 
-def html_escape(text):
-    if type(text) is str:
-        return "".join(html_escape_table.get(c,c) for c in text)
-    else:
-        return "False"
+html_escape_translation = str.maketrans(html_escape_table)
+
+def html_escape_column(column):
+    """Produce entities within every value of a column at once."""
+    return column.astype(str).str.translate(html_escape_translation)
 
 
 # ## Creating the markdown files
 # 
-# This is where the heavy lifting is done. This loops through all the rows in the TSV dataframe, then starts to concatentate a big string (```md```) that contains the markdown for each type. It does the YAML metadata first, then does the description for the individual page.
+# This is where the heavy lifting is done. Rather than looping through the rows of the TSV dataframe, each column is prepared at once with pandas string operations: values are escaped, and each optional field is filled in or left blank depending on whether the row has a value for it. Every page is then rendered through the single template below, which does the YAML metadata first, then the description for the individual page.
 
 # In[5]:
 
-loc_dict = {}
-
-for row, item in talks.iterrows():
-    
-    md_filename = str(item.date) + "-" + item.url_slug + ".md"
-    html_filename = str(item.date) + "-" + item.url_slug 
-    year = item.date[:4]
-    
-    md = "---\ntitle: \""   + item.title + '"\n'
-    md += "collection: talks" + "\n"
-    
-    if len(str(item.type)) > 3:
-        md += 'type: "' + item.type + '"\n'
-    else:
-        md += 'type: "Talk"\n'
-    
-    md += "permalink: /talks/" + html_filename + "\n"
-    
-    if len(str(item.venue)) > 3:
-        md += 'venue: "' + item.venue + '"\n'
-        
-    if len(str(item.date)) > 3:
-        md += "date: " + str(item.date) + "\n"
-    
-    if len(str(item.location)) > 3:
-        md += 'location: "' + str(item.location) + '"\n'
-           
-    md += "---\n"
-    
-    
-    if len(str(item.talk_url)) > 3:
-        md += "\n[More information here](" + item.talk_url + ")\n" 
-        
-    
-    if len(str(item.description)) > 3:
-        md += "\n" + html_escape(item.description) + "\n"
-        
-        
-    md_filename = os.path.basename(md_filename)
-    #print(md)
-    
-    with open("../_talks/" + md_filename, 'w') as f:
-        f.write(md)
+from page_writer import print_summary, write_pages
+
+page_template = (
+    '---\ntitle: "{title}"\n'
+    'collection: talks\n'
+    'type: "{type}"\n'
+    'permalink: /talks/{html_filename}\n'
+    '{venue}'
+    '{date}'
+    '{location}'
+    '---\n'
+    '{talk_url}'
+    '{description}'
+)
+
+def render_pages(talks):
+    """Render every row of a talks dataframe as (md_filename, markdown)."""
+    def present(column):
+        # Blank cells read as NaN, i.e. "nan", so require more than 3 characters
+        return talks[column].astype(str).str.len() > 3
+
+    def field(column):
+        return talks[column].astype(str)
+
+    html_filename = field("date") + "-" + field("url_slug")
+
+    columns = {
+        "title": field("title"),
+        "type": field("type").where(present("type"), "Talk"),
+        "html_filename": html_filename,
+        "venue": ('venue: "' + field("venue") + '"\n').where(present("venue"), ""),
+        "date": ("date: " + field("date") + "\n").where(present("date"), ""),
+        "location": ('location: "' + field("location") + '"\n').where(present("location"), ""),
+        "talk_url": ("\n[More information here](" + field("talk_url") + ")\n").where(present("talk_url"), ""),
+        "description": ("\n" + html_escape_column(talks.description) + "\n").where(present("description"), ""),
+    }
 
+    names = list(columns)
+    pages = [page_template.format(**dict(zip(names, values))) for values in zip(*columns.values())]
+    return list(zip(html_filename + ".md", pages))
 
-# These files are in the talks directory, one directory below where we're working from.
 
+# Pages are only written if their content changed, see page_writer.py
+chunks = talks if args.chunksize else [talks]
+pages = (page for chunk in chunks for page in render_pages(chunk))
+print_summary(write_pages(pages, args.output), args.output)
+
+
+# These files are in the talks directory, one directory below where we're working from.
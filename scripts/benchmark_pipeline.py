@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Benchmark the content pipeline scripts against a synthetic corpus.
+
+A reproducible corpus of the requested size is generated for each stage in
+a scratch directory laid out like this repository: _publications, _talks, _posts,
+_teaching and _portfolio pages, TSVs for the markdown generators, BibTeX
+files, image manifests with their anchors in the posts, a gazetteer so
+talkmap.py geocodes offline, and a CV extended with cv_entries education,
+work experience and skills entries. Each stage then runs as a subprocess, twice:
+"cold" on the fresh corpus and "warm" right after with nothing changed, which
+is what the incremental builds are optimized for.
+
+For every run the wall time, the peak RSS of the process and the number of
+files created or modified are reported. The script exits with status 1 when
+a stage fails. With --baseline the results are also compared to a stored run,
+and a stage that got slower or bigger than the tolerance allows, writes a
+different number of files, fails or is missing from the results counts as a
+regression; --save-baseline stores the current run instead.
+
+    python scripts/benchmark_pipeline.py --publications 2000 --talks 2000 --posts 200
+    python scripts/benchmark_pipeline.py --save-baseline benchmark-baseline.json
+    python scripts/benchmark_pipeline.py --baseline benchmark-baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import tempfile
+import argparse
+import platform
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Corpus sizes used when no option is given
+SIZES = {"publications": 500, "talks": 500, "posts": 50, "images": 500, "bib": 500, "cv_entries": 200}
+
+WORDS = """
+alloy band gap boundary cluster crystal density diffusion dislocation electron
+energy entropy fracture grain interface lattice machine learning model neural
+network oxide phase potential regression simulation strain stress surface
+temperature thermal vacancy zirconium gradient descent feature kernel
+""".split()
+CHINESE = ["材料", "扩散", "晶格", "梯度下降", "神经网络", "回归", "能带", "合金"]
+CITIES = [("Shenzhen, China", 22.54, 114.06), ("Paris, France", 48.86, 2.35),
+          ("Boston, USA", 42.36, -71.06), ("Tokyo, Japan", 35.68, 139.69),
+          ("Berlin, Germany", 52.52, 13.40), ("Sydney, Australia", -33.87, 151.21)]
+
+# Each stage: argv (run from the corpus root, {python} and {repo} expanded)
+STAGES = [
+    ("cv_json", ["{python}", "{repo}/scripts/cv_markdown_to_json.py", "-i", "_pages/cv.md",
+                 "-o", "_data/cv.json", "-c", "_config.yml"]),
+    ("cv_json_incremental", ["{python}", "{repo}/scripts/cv_markdown_to_json.py", "-i", "_pages/cv.md",
+                             "-o", "_data/cv_incremental.json", "-c", "_config.yml", "--incremental"]),
+    ("pubsFromBib", ["{python}", "{repo}/markdown_generator/pubsFromBib.py", "bib/*.bib",
+                     "--output", "generated/bib_publications/"]),
+    ("publications_tsv", ["{python}", "{repo}/markdown_generator/publications.py",
+                          "markdown_generator/publications.tsv", "--output", "generated/tsv_publications/"]),
+    ("talks_tsv", ["{python}", "{repo}/markdown_generator/talks.py",
+                   "markdown_generator/talks.tsv", "--output", "generated/tsv_talks/"]),
+    ("image_insertion", ["{python}", "{repo}/image_insertion.py", "--root", "."]),
+    ("talkmap", ["{python}", "{repo}/talkmap.py", "--backend", "gazetteer", "--gazetteer", "gazetteer.tsv",
+                 "--rate", "0", "--geojson", "--tiles"]),
+]
+
+def sentence(rng, words=12, chinese=False):
+    """A random sentence, optionally mixing in Chinese terms"""
+    tokens = [rng.choice(WORDS) for _ in range(words)]
+    if chinese:
+        tokens.insert(rng.randrange(len(tokens)), rng.choice(CHINESE))
+    return " ".join(tokens).capitalize() + "."
+
+def write(path, text):
+    """Write text to path, creating its directory"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def generate_cv_sections(rng, entries):
+    """Markdown for Education, Work experience and Skills sections of entries items each"""
+    cv = ["", "Education", "======"]
+    cv += [f"* Ph.D in {sentence(rng, 3)[:-1]}, University {i}, {1990 + i % 35}, GPA: 3.{i % 10}\n"
+           f"  * {sentence(rng)}" for i in range(entries)]
+    cv += ["", "Work experience", "======"]
+    cv += [f"* Engineer {i}, Company {i % 50}, {1990 + i % 35} - present\n  * {sentence(rng)}\n  - {sentence(rng)}"
+           for i in range(entries)]
+    cv += ["", "Skills", "======"]
+    cv += [f"Category {i}: {', '.join(rng.sample(WORDS, 4))},\n  {', '.join(rng.sample(WORDS, 3))}"
+           for i in range(entries)]
+    return "\n".join(cv) + "\n"
+
+def generate_corpus(root, sizes, seed=0):
+    """Write a synthetic repository of the given sizes below root"""
+    rng = random.Random(seed)
+    for name in ("_pages/cv.md", "_config.yml"):
+        os.makedirs(os.path.dirname(os.path.join(root, name)), exist_ok=True)
+        shutil.copy(os.path.join(REPO_ROOT, name), os.path.join(root, name))
+
+    with open(os.path.join(root, "_pages", "cv.md"), "a", encoding="utf-8") as f:
+        f.write(generate_cv_sections(rng, sizes["cv_entries"]))
+
+    pub_rows, bib_entries = [], []
+    for i in range(sizes["publications"]):
+        date = f"{2000 + i % 25}-{1 + i % 12:02d}-{1 + i % 28:02d}"
+        title = f"Study {i} of {sentence(rng, 5)[:-1]}"
+        write(os.path.join(root, "_publications", f"{date}-paper-{i}.md"),
+              f"---\ntitle: \"{title}\"\ncollection: publications\npermalink: /publication/{date}-paper-{i}\n"
+              f"excerpt: '{sentence(rng)}'\ndate: {date}\nvenue: 'Journal {i % 40}'\n"
+              f"paperurl: 'http://example.org/paper{i}.pdf'\n---\n{sentence(rng, 40)}\n")
+        pub_rows.append("\t".join([date, title, f"Journal {i % 40}", sentence(rng), f"Author, A. ({date[:4]}). {title}.",
+                                   f"paper-{i}", f"http://example.org/paper{i}.pdf", ""]))
+    for i in range(sizes["bib"]):
+        bib_entries.append(f"@article{{key{i},\n  title = {{{sentence(rng, 6)[:-1]} {i}}},\n"
+                           f"  author = {{Doe, Jane and Roe, Richard}},\n  journal = {{Journal {i % 40}}},\n"
+                           f"  year = {{{2000 + i % 25}}},\n  month = {{{1 + i % 12}}},\n"
+                           f"  url = {{http://example.org/bib{i}}},\n  note = {{{sentence(rng)}}}\n}}\n")
+
+    talk_rows, gazetteer = [], ["location\tlat\tlng"]
+    for i in range(sizes["talks"]):
+        city, lat, lng = CITIES[i % len(CITIES)]
+        # Distinct venues per city give the geocoder real work
+        location = f"Venue {i % 97}, {city}"
+        gazetteer.append(f"{location}\t{lat + (i % 97) / 1000:.4f}\t{lng + (i % 97) / 1000:.4f}")
+        date = f"{2010 + i % 15}-{1 + i % 12:02d}-01"
+        write(os.path.join(root, "_talks", f"{date}-talk-{i}.md"),
+              f"---\ntitle: \"Talk {i}\"\ncollection: talks\ntype: \"Talk\"\npermalink: /talks/{date}-talk-{i}\n"
+              f"venue: \"Institute {i % 50}\"\ndate: {date}\nlocation: \"{location}\"\n---\n{sentence(rng)}\n")
+        talk_rows.append("\t".join([f"Talk {i}", "Talk", f"talk-{i}", f"Institute {i % 50}", date, location, "",
+                                    sentence(rng)]))
+    write(os.path.join(root, "gazetteer.tsv"), "\n".join(dict.fromkeys(gazetteer)) + "\n")
+
+    posts = max(1, sizes["posts"])
+    anchors_per_post = [sizes["images"] // posts + (i < sizes["images"] % posts) for i in range(posts)]
+    for i, anchors in enumerate(anchors_per_post):
+        date = f"{2015 + i % 10}-{1 + i % 12:02d}-{1 + i % 28:02d}"
+        path = f"_posts/{date}-post-{i}.md"
+        body = []
+        images = []
+        for j in range(max(anchors, 10)):
+            body.append(f"## Section {j}\n\n{sentence(rng, 30, chinese=True)} Marker {i}-{j} here.\n")
+            if j < anchors:
+                images.append({"search": f"Marker {i}-{j} here.",
+                               "image_md": f"![Figure {j}](https://example.org/img/{i}-{j}.png)"})
+        write(os.path.join(root, path),
+              f"---\ntitle: 'Post {i}'\ndate: {date}\npermalink: /posts/{date[:7].replace('-', '/')}/post-{i}/\n"
+              f"tags:\n  - benchmark\n---\n\n" + "\n".join(body))
+        write(os.path.join(root, "image_manifests", f"{date}-post-{i}.json"),
+              json.dumps({"post": path, "images": images}, indent=2))
+
+    for collection, count in (("_teaching", 20), ("_portfolio", 20)):
+        for i in range(count):
+            write(os.path.join(root, collection, f"item-{i}.md"),
+                  f"---\ntitle: \"{collection[1:]} {i}\"\ncollection: {collection[1:]}\ntype: \"Course\"\n"
+                  f"permalink: /{collection[1:]}/item-{i}\nvenue: \"University {i}\"\ndate: 2020-01-01\n---\n")
+
+    header_pub = "pub_date\ttitle\tvenue\texcerpt\tcitation\turl_slug\tpaper_url\tslides_url"
+    header_talk = "title\ttype\turl_slug\tvenue\tdate\tlocation\ttalk_url\tdescription"
+    write(os.path.join(root, "markdown_generator", "publications.tsv"), "\n".join([header_pub] + pub_rows) + "\n")
+    write(os.path.join(root, "markdown_generator", "talks.tsv"), "\n".join([header_talk] + talk_rows) + "\n")
+    write(os.path.join(root, "bib", "pubs.bib"), "\n".join(bib_entries))
+    os.makedirs(os.path.join(root, "_data"), exist_ok=True)
+    os.makedirs(os.path.join(root, "talkmap"), exist_ok=True)
+
+def snapshot(root):
+    """Map every file below root to its (mtime_ns, size)"""
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            stat = os.stat(path)
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+def run_stage(argv, root):
+    """Run one stage; return wall time, peak RSS, files written and status"""
+    argv = [arg.format(python=sys.executable, repo=REPO_ROOT) for arg in argv]
+    before = snapshot(root)
+    start = time.perf_counter()
+    process = subprocess.Popen(argv, cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    stderr = process.stderr.read()
+    # wait4 gives the resource usage of this child alone
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - start
+    after = snapshot(root)
+
+    written = sum(1 for path, state in after.items() if before.get(path) != state)
+    result = {"wall_s": round(wall, 3), "peak_rss_mb": round(usage.ru_maxrss / 1024, 1), "files_written": written}
+    if process.returncode:
+        result["error"] = stderr.decode("utf-8", "replace").strip().splitlines()[-1:] or [f"exit {process.returncode}"]
+    return result
+
+def run_benchmarks(root, sizes, stages=STAGES, seed=0, repeat=1):
+    """Run every stage cold and then warm, each on its own copy of the corpus
+
+    Separate corpora keep stages from warming caches for each other (talkmap
+    and the CV builder share the front matter index), so the numbers do not
+    depend on which stages were selected. With repeat > 1 the corpus is
+    regenerated for every round and the median wall time is reported.
+    """
+    results = {}
+    for name, argv in stages:
+        stage_root = os.path.join(root, name)
+        rounds = {"cold": [], "warm": []}
+        for _ in range(repeat):
+            shutil.rmtree(stage_root, ignore_errors=True)
+            generate_corpus(stage_root, sizes, seed)
+            rounds["cold"].append(run_stage(argv, stage_root))
+            rounds["warm"].append(run_stage(argv, stage_root))
+
+        results[name] = {}
+        for run, runs in rounds.items():
+            result = dict(runs[-1])
+            result["wall_s"] = statistics.median(r["wall_s"] for r in runs)
+            result["peak_rss_mb"] = max(r["peak_rss_mb"] for r in runs)
+            results[name][run] = result
+    return results
+
+def compare(results, baseline, tolerance, stages=None):
+    """List the regressions of results against a baseline run
+
+    Baseline runs of the given stage names (default: every stage of the
+    baseline) that are missing from results count as regressions, and so
+    do runs that fail.
+    """
+    regressions = []
+    for name, runs in baseline.get("results", {}).items():
+        if stages is not None and name not in stages:
+            continue
+        for run in runs:
+            if run not in results.get(name, {}):
+                regressions.append(f"{name} ({run}): missing from the results")
+
+    for name, runs in results.items():
+        for run, result in runs.items():
+            reference = baseline.get("results", {}).get(name, {}).get(run)
+            if "error" in result:
+                state = "still fails" if reference is not None and "error" in reference else "fails"
+                regressions.append(f"{name} ({run}): {state}: {' '.join(result['error'])}")
+                continue
+            if reference is None or "error" in reference:
+                continue
+            for metric in ("wall_s", "peak_rss_mb"):
+                # Ignore noise on runs that are too short to time reliably
+                if metric == "wall_s" and reference[metric] < 0.2:
+                    continue
+                if result[metric] > reference[metric] * (1 + tolerance):
+                    regressions.append(f"{name} ({run}): {metric} {reference[metric]} -> {result[metric]}")
+            if result["files_written"] != reference["files_written"]:
+                regressions.append(f"{name} ({run}): files_written "
+                                   f"{reference['files_written']} -> {result['files_written']}")
+    return regressions
+
+def print_results(results, baseline=None):
+    """Print a table of the results next to the baseline wall times"""
+    reference = (baseline or {}).get("results", {})
+    print(f"{'stage':<22}{'run':<6}{'wall s':>9}{'peak MB':>9}{'files':>8}{'base s':>9}")
+    for name, runs in results.items():
+        for run, result in runs.items():
+            base = reference.get(name, {}).get(run, {}).get("wall_s", "")
+            print(f"{name:<22}{run:<6}{result['wall_s']:>9}{result['peak_rss_mb']:>9}"
+                  f"{result['files_written']:>8}{base:>9}")
+            if "error" in result:
+                print(f"  failed: {' '.join(result['error'])}")
+
+def main():
+    """Main function to parse arguments and run the benchmarks"""
+    parser = argparse.ArgumentParser(description='Benchmark the content pipeline on a synthetic corpus')
+    for name, size in SIZES.items():
+        parser.add_argument(f'--{name}', type=int, default=size, help=f'Number of {name} (default: {size})')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus random seed')
+    parser.add_argument('--repeat', type=int, default=3, help='Rounds per stage; wall times are medians (default: 3)')
+    parser.add_argument('--stage', action='append', choices=[name for name, _ in STAGES],
+                        help='Only run this stage (repeatable)')
+    parser.add_argument('--workdir', help='Generate the corpus here and keep it (default: a temporary directory)')
+    parser.add_argument('--baseline', help='Compare against this stored run')
+    parser.add_argument('--save-baseline', help='Store this run as a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative slowdown or memory growth (default: 0.25)')
+    args = parser.parse_args()
+
+    sizes = {name: getattr(args, name) for name in SIZES}
+    stages = [stage for stage in STAGES if not args.stage or stage[0] in args.stage]
+    root = args.workdir or tempfile.mkdtemp(prefix="pipeline-benchmark-")
+    try:
+        results = run_benchmarks(root, sizes, stages, args.seed, max(1, args.repeat))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("sizes") != sizes:
+            print(f"Warning: baseline corpus sizes {baseline.get('sizes')} differ from {sizes}")
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({"sizes": sizes, "repeat": args.repeat, "python": platform.python_version(),
+                       "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {args.save_baseline}")
+
+    failed = [f"{name} ({run})" for name, runs in results.items() for run, result in runs.items()
+              if "error" in result]
+    regressions = []
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance, args.stage)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+    if failed:
+        print(f"FAILED {len(failed)} runs: {', '.join(failed)}")
+    sys.exit(1 if regressions or failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Build a sharded inverted search index for the posts and publications.
+
+Each document is stripped of front matter, Liquid, HTML, images and link
+targets, then tokenized: runs of ASCII letters and digits become words
+(lowercased, stop words dropped) and runs of CJK characters become
+overlapping character bigrams, so mixed English/Chinese posts are
+searchable in both languages without a dictionary. Title tokens count
+TITLE_WEIGHT times.
+
+The output directory (assets/search/ by default) holds index.json, with the
+document metadata and the list of shards, and shards/{key}.json, mapping
+each term to its [document id, term frequency] postings. A term's shard key
+is its first character for ASCII terms and the block of its first code
+point for CJK terms, so the browser (assets/js/search-index.js) only loads
+the shards of the terms in a query.
+
+Rebuilds are incremental: the per-document terms are kept in a state file
+keyed by the SHA-256 of each source file, only new or changed files are
+re-tokenized, and only shards whose content changed are rewritten.
+"""
+
+import os
+import re
+import json
+import hashlib
+import argparse
+import unicodedata
+from frontmatter_index import FrontMatterIndex, collection_files, DEFAULT_DB
+
+COLLECTIONS = ("_posts", "_publications")
+OUTPUT_DIR = os.path.join("assets", "search")
+STATE_FILE = os.path.join(".cache", "search_index.json")
+STATE_VERSION = 1
+TITLE_WEIGHT = 3
+EXCERPT_LENGTH = 160
+
+STOP_WORDS = frozenset("""
+a an and are as at be but by can for from has have if in into is it its of on
+or our so such than that the their then there these this to was we were what
+when which will with you your
+""".split())
+
+CJK = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+TOKEN_RE = re.compile(f"[a-z0-9]+|[{CJK}]+")
+CJK_RE = re.compile(f"[{CJK}]")
+
+# Markup removed before tokenizing, in order
+MARKUP_PATTERNS = [
+    (re.compile(r"\A---\s*\n.*?\n---\s*\n", re.DOTALL), " "),
+    (re.compile(r"\{%.*?%\}|\{\{.*?\}\}", re.DOTALL), " "),
+    (re.compile(r"!\[[^\]]*\]\([^)]*\)"), " "),
+    (re.compile(r"\[([^\]]*)\]\([^)]*\)"), r"\1"),
+    (re.compile(r"<[^>]+>"), " "),
+    (re.compile(r"https?://\S+"), " "),
+    (re.compile(r"[`*_#>|~]+"), " "),
+]
+
+def strip_markup(text):
+    """Reduce a markdown document to its searchable text"""
+    for pattern, replacement in MARKUP_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return re.sub(r"\s+", " ", text).strip()
+
+def tokenize(text):
+    """Split text into index terms: ASCII words and CJK character bigrams"""
+    tokens = []
+    for run in TOKEN_RE.findall(unicodedata.normalize("NFKC", text).lower()):
+        if CJK_RE.match(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        elif len(run) > 1 and run not in STOP_WORDS:
+            tokens.append(run)
+    return tokens
+
+def term_frequencies(title, body):
+    """Count the terms of a document, weighting title terms"""
+    counts = {}
+    for token in tokenize(body):
+        counts[token] = counts.get(token, 0) + 1
+    for token in tokenize(title):
+        counts[token] = counts.get(token, 0) + TITLE_WEIGHT
+    return counts
+
+def shard_key(term):
+    """Shard of a term: its first ASCII character, or its CJK code point block"""
+    if term[0].isascii():
+        return term[0]
+    return f"u{ord(term[0]) >> 8:02x}"
+
+def document_url(path, front_matter):
+    """URL of a document, from its permalink or Jekyll's default for the collection"""
+    if front_matter.get("permalink"):
+        return front_matter["permalink"]
+    name = os.path.splitext(os.path.basename(path))[0]
+    collection = path.split("/", 1)[0].lstrip("_")
+    if collection == "posts":
+        name = re.sub(r"^\d{4}-\d{2}-\d{2}-", "", name)
+    return f"/{collection}/{name}/"
+
+def index_document(path, raw, front_matter):
+    """Return the metadata and term frequencies of one source file"""
+    front_matter = front_matter or {}
+    body = strip_markup(raw.decode("utf-8"))
+    title = str(front_matter.get("title") or os.path.splitext(os.path.basename(path))[0])
+    excerpt = strip_markup(str(front_matter.get("excerpt") or "")) or body[:EXCERPT_LENGTH]
+    doc = {
+        "title": title,
+        "url": document_url(path, front_matter),
+        "collection": path.split("/", 1)[0].lstrip("_"),
+        "date": str(front_matter.get("date") or ""),
+        "excerpt": excerpt,
+    }
+    return doc, term_frequencies(title, body)
+
+def load_state(state_file):
+    """Load the incremental state, discarding it if written by another version"""
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        state = {}
+    if state.get("version") != STATE_VERSION:
+        state = {"version": STATE_VERSION, "next_id": 0, "documents": {}}
+    return state
+
+def write_json_if_changed(path, data):
+    """Write data as compact JSON unless the file already holds it"""
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return True
+
+def build_search_index(repo_root, output_dir, state_file, collections=COLLECTIONS, index_file=None):
+    """Update the search index under output_dir.
+
+    Returns a dict with the number of documents "indexed" (re-tokenized),
+    "unchanged" and "removed", and of shards "written" and "deleted".
+    """
+    state = load_state(state_file)
+    previous = state["documents"]
+    documents = {}
+    stats = {"indexed": 0, "unchanged": 0}
+
+    md_files = [md_file for collection in collections
+                for md_file in collection_files(os.path.join(repo_root, collection))]
+    with FrontMatterIndex(repo_root, index_file or ":memory:") as index:
+        front_matters = index.read(md_files)
+        paths = [index.relative_path(md_file) for md_file in md_files]
+
+    for path, md_file, front_matter in zip(paths, md_files, front_matters):
+        with open(md_file, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+
+        entry = previous.get(path)
+        if entry and entry["sha256"] == digest:
+            documents[path] = entry
+            stats["unchanged"] += 1
+            continue
+
+        doc, terms = index_document(path, raw, front_matter)
+        # Keep document ids stable so unchanged shards stay byte-identical
+        doc_id = entry["id"] if entry else state["next_id"]
+        state["next_id"] = max(state["next_id"], doc_id + 1)
+        documents[path] = {"sha256": digest, "id": doc_id, "doc": doc, "terms": terms}
+        stats["indexed"] += 1
+    stats["removed"] = len(set(previous) - set(documents))
+
+    # Postings are regrouped from the cached term counts; only changed shards are written
+    shards = {}
+    for entry in sorted(documents.values(), key=lambda entry: entry["id"]):
+        for term, count in entry["terms"].items():
+            shards.setdefault(shard_key(term), {}).setdefault(term, []).append([entry["id"], count])
+
+    shard_dir = os.path.join(output_dir, "shards")
+    stats["written"] = sum(
+        write_json_if_changed(os.path.join(shard_dir, f"{key}.json"), postings)
+        for key, postings in shards.items()
+    )
+    stats["deleted"] = 0
+    if os.path.isdir(shard_dir):
+        for name in os.listdir(shard_dir):
+            if name.endswith(".json") and name[:-5] not in shards:
+                os.remove(os.path.join(shard_dir, name))
+                stats["deleted"] += 1
+
+    write_json_if_changed(os.path.join(output_dir, "index.json"), {
+        "version": STATE_VERSION,
+        "documents": {str(entry["id"]): entry["doc"] for entry in documents.values()},
+        "shards": sorted(shards),
+    })
+
+    state["documents"] = documents
+    os.makedirs(os.path.dirname(os.path.abspath(state_file)), exist_ok=True)
+    with open(state_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    return stats
+
+def main():
+    """Main function to parse arguments and build the index"""
+    parser = argparse.ArgumentParser(description='Build the sharded search index for posts and publications')
+    parser.add_argument('--root', default='.', help='Repository root (default: current directory)')
+    parser.add_argument('--output', '-o', help=f'Output directory (default: <root>/{OUTPUT_DIR})')
+    parser.add_argument('--state', help=f'Incremental state file (default: <root>/{STATE_FILE})')
+    parser.add_argument('--index', help=f'Front matter index file (default: <root>/{DEFAULT_DB}, "" for none)')
+    parser.add_argument('--collection', action='append', dest='collections',
+                        help='Collection directory to index, repeatable (default: _posts and _publications)')
+    args = parser.parse_args()
+
+    output_dir = args.output or os.path.join(args.root, OUTPUT_DIR)
+    state_file = args.state or os.path.join(args.root, STATE_FILE)
+    index_file = os.path.join(args.root, DEFAULT_DB) if args.index is None else args.index
+    stats = build_search_index(args.root, output_dir, state_file,
+                               tuple(args.collections or COLLECTIONS), index_file)
+    print(f"Indexed {stats['indexed']} documents ({stats['unchanged']} unchanged, {stats['removed']} removed); "
+          f"wrote {stats['written']} shards, deleted {stats['deleted']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Check the single-pass CV tokenizer against the regex parsers it replaced.
+
+tokenize_cv, group_entries and group_fields in cv_markdown_to_json.py
+replaced regular expressions that rescanned the whole CV and every section,
+and must produce exactly what they did. Those regex parsers are kept here as
+the reference, and for every document of a corpus the script compares:
+
+- the sections of split_markdown_sections with the regex section splitter,
+- the bullet entries and "name: value" fields of every section with the
+  regex entry and field splits,
+- the education, work experience and skills parsed from the sections of
+  those names and from every other section.
+
+The corpus is the site's CV, large CVs made of it plus generated Education,
+Work experience and Skills sections (as benchmark_pipeline.py builds them),
+and seeded random documents mixing headings, underlines, bullets, colons,
+front matter and unusual whitespace. Any mismatch is printed and makes the
+script exit with status 1.
+
+    python scripts/check_cv_parser.py
+    python scripts/check_cv_parser.py --cv-entries 2000 --random 20000
+"""
+
+import os
+import re
+import sys
+import random
+import argparse
+from benchmark_pipeline import REPO_ROOT, SIZES, generate_cv_sections
+from cv_markdown_to_json import (EMPTY_SECTION, tokenize_cv, split_markdown_sections, parse_education,
+                                 parse_work_experience, parse_skills)
+
+CV_FILE = os.path.join(REPO_ROOT, "_pages", "cv.md")
+LARGE_CVS = 3
+RANDOM_DOCUMENTS = 5000
+MAX_REPORTED = 10
+
+# Building blocks of the random documents
+PIECES = ["* ", "*", "**", "- ", "-", ":", ": ", ",", ", ", " ", "  ", "\t", "\r", "\x0b", "\x0c", "\xa0",
+          "\u2028", "=", "#", "(", ".", "---", "x", "1", "_a", "é", "Python", "Acme", "GPA: 3.9",
+          "2019 - 2021", "2019-present", "Ph.D, MIT, 2020", "Engineer, Acme, 2018 - 2020"]
+HEADINGS = ["Education", "Work experience", "Skills", "Publications", "  Skills  "]
+FRONT_MATTER = ["", "---\ntitle: x\n---\n", "---\na---b\n\n  ", "--- no end", "----\n---\n"]
+
+def legacy_sections(content):
+    """Split the markdown CV text into a dict of section name to body"""
+    # Remove YAML front matter
+    content = re.sub(r'^---.*?---\s*', '', content, flags=re.DOTALL)
+
+    sections = {}
+    current_section = None
+    section_content = []
+    for line in content.split('\n'):
+        if re.match(r'^=+$', line):
+            continue
+
+        section_match = re.match(r'^([A-Za-z\s]+)$', line.strip())
+        if section_match and len(line.strip()) > 0:
+            if current_section:
+                sections[current_section] = '\n'.join(section_content).strip()
+                section_content = []
+            current_section = section_match.group(1).strip()
+        elif current_section:
+            section_content.append(line)
+
+    if current_section and section_content:
+        sections[current_section] = '\n'.join(section_content).strip()
+    return sections
+
+def legacy_entries(text):
+    """The bullet entries of a section body"""
+    return re.findall(r'\* (.*?)(?=\n\*|\Z)', text, re.DOTALL)
+
+def legacy_fields(text):
+    """The (name, value) fields of a section body"""
+    return re.findall(r'(?:^|\n)(\w+.*?):\s*(.*?)(?=\n\w+.*?:|\Z)', text, re.DOTALL)
+
+def legacy_education(text):
+    """Parse an education section body"""
+    education_entries = []
+    for entry in legacy_entries(text):
+        match = re.match(r'([^,]+), ([^,]+), (\d{4})(.*)', entry.strip())
+        if match:
+            degree, institution, year, additional = match.groups()
+            gpa_match = re.search(r'GPA: ([\d\.]+)', additional)
+            education_entries.append({
+                "institution": institution.strip(),
+                "area": degree.strip(),
+                "studyType": "",
+                "startDate": "",
+                "endDate": year.strip(),
+                "gpa": gpa_match.group(1) if gpa_match else None,
+                "courses": []
+            })
+    return education_entries
+
+def legacy_work_experience(text):
+    """Parse a work experience section body"""
+    work_entries = []
+    for entry in legacy_entries(text):
+        lines = entry.strip().split('\n')
+        position_match = re.match(r'(.*?), (.*?)(?:, |$)', lines[0].strip())
+        if position_match:
+            position, company = position_match.groups()
+            date_match = re.search(r'(\d{4})\s*-\s*(\d{4}|present)', entry, re.IGNORECASE)
+            highlights = []
+            for line in lines[1:]:
+                if line.strip().startswith('*') or line.strip().startswith('-'):
+                    highlights.append(line.strip()[1:].strip())
+            work_entries.append({
+                "company": company.strip(),
+                "position": position.strip(),
+                "website": "",
+                "startDate": date_match.group(1) if date_match else "",
+                "endDate": date_match.group(2) if date_match else "",
+                "summary": "",
+                "highlights": highlights
+            })
+    return work_entries
+
+def legacy_skills(text):
+    """Parse a skills section body"""
+    skills_entries = []
+    for category, skills in legacy_fields(text):
+        skills_entries.append({
+            "name": category.strip(),
+            "level": "",
+            "keywords": [s.strip() for s in re.split(r',|\n', skills) if s.strip()]
+        })
+    return skills_entries
+
+# Section name, parser under test and its reference
+PARSERS = [
+    ("Education", parse_education, legacy_education),
+    ("Work experience", parse_work_experience, legacy_work_experience),
+    ("Skills", parse_skills, legacy_skills),
+]
+
+def random_document(rng):
+    """A random CV-like document, mostly malformed"""
+    lines = []
+    for _ in range(rng.randint(0, 30)):
+        kind = rng.random()
+        if kind < 0.08:
+            lines.append(rng.choice(HEADINGS))
+        elif kind < 0.12:
+            lines.append("=" * rng.randint(1, 4))
+        elif kind < 0.2:
+            lines.append("")
+        else:
+            lines.append("".join(rng.choice(PIECES) for _ in range(rng.randint(1, 6))))
+    return rng.choice(FRONT_MATTER) + "\n".join(lines)
+
+def corpus(cv_file=CV_FILE, cv_entries=SIZES["cv_entries"], large_cvs=LARGE_CVS, random_documents=RANDOM_DOCUMENTS,
+           seed=0):
+    """Yield (label, text) for every document to check"""
+    with open(cv_file, "r", encoding="utf-8") as f:
+        cv = f.read()
+    yield cv_file, cv
+    for i in range(large_cvs):
+        rng = random.Random(f"{seed}-large-{i}")
+        yield f"large CV {i} ({cv_entries} entries per section)", cv + generate_cv_sections(rng, cv_entries)
+    for i in range(random_documents):
+        yield f"random document {i}", random_document(random.Random(f"{seed}-random-{i}"))
+
+def check_document(content):
+    """List (what, expected, actual) for every output differing from the reference"""
+    mismatches = []
+
+    def compare(what, expected, actual):
+        if expected != actual:
+            mismatches.append((what, expected, actual))
+
+    reference = legacy_sections(content)
+    compare("sections", reference, split_markdown_sections(content))
+
+    sections = tokenize_cv(content)
+    by_name = {section.name: section for section in sections}
+    for name, parser, legacy in PARSERS:
+        compare(f"{parser.__name__} of {name!r}", legacy(reference.get(name, "")),
+                parser(by_name.get(name, EMPTY_SECTION)))
+
+    for section in sections:
+        text = section.text
+        compare(f"entries of {section.name!r} (line {section.line})", legacy_entries(text),
+                [entry.text for entry in section.entries])
+        # The field regex also drops the blank space after the colon
+        compare(f"fields of {section.name!r} (line {section.line})", legacy_fields(text),
+                [(field.name, field.text.lstrip()) for field in section.fields])
+        for _, parser, legacy in PARSERS:
+            compare(f"{parser.__name__} of {section.name!r} (line {section.line})", legacy(text),
+                    parser(section))
+    return mismatches
+
+def shorten(value, limit=300):
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+def main():
+    """Main function to parse arguments and check the parser"""
+    parser = argparse.ArgumentParser(description='Check the CV tokenizer against the regex parsers it replaced')
+    parser.add_argument('--cv', default=CV_FILE, help='Markdown CV the large CVs start from (default: _pages/cv.md)')
+    parser.add_argument('--cv-entries', type=int, default=SIZES["cv_entries"],
+                        help=f'Generated entries per section of the large CVs (default: {SIZES["cv_entries"]})')
+    parser.add_argument('--large', type=int, default=LARGE_CVS, help=f'Large CVs to check (default: {LARGE_CVS})')
+    parser.add_argument('--random', type=int, default=RANDOM_DOCUMENTS,
+                        help=f'Random documents to check (default: {RANDOM_DOCUMENTS})')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus random seed')
+    args = parser.parse_args()
+
+    documents = failed = reported = 0
+    for label, content in corpus(args.cv, args.cv_entries, args.large, args.random, args.seed):
+        documents += 1
+        mismatches = check_document(content)
+        if mismatches:
+            failed += 1
+        for what, expected, actual in mismatches:
+            reported += 1
+            if reported <= MAX_REPORTED:
+                print(f"MISMATCH in {label}: {what}")
+                print(f"  expected {shorten(expected)}")
+                print(f"  got      {shorten(actual)}")
+
+    print(f"Checked {documents} documents, {failed} with mismatches")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Check the external links and image URLs of the site.
+
+Every http(s) URL in _posts, _publications, _talks and _data/cv.json is
+collected (Liquid-templated URLs are skipped) and checked with HEAD
+requests, falling back to a one-byte ranged GET for servers that reject
+HEAD, and following redirects. Requests run on asyncio with a global
+concurrency bound and a keep-alive connection pool per host, limited to a
+few connections each so no server is hammered. Only the standard library
+is used.
+
+Results are cached in .cache/link_check.json with a TTL (shorter for
+failures), so re-runs only check new or stale URLs. Broken links are listed
+with the files that reference them and make the script exit with status 1.
+
+For tests, --map rewrites URL prefixes, e.g. to send every image request to
+a local stub server:
+
+    python scripts/check_links.py --map https://raw.githubusercontent.com=http://127.0.0.1:8000
+"""
+
+import os
+import re
+import ssl
+import json
+import time
+import asyncio
+import argparse
+from urllib.parse import urljoin, urlsplit
+
+SOURCES = ("_posts", "_publications", "_talks")
+CV_JSON = os.path.join("_data", "cv.json")
+CACHE_FILE = os.path.join(".cache", "link_check.json")
+TTL = 7 * 86400
+FAILURE_TTL = 86400
+CONCURRENCY = 20
+PER_HOST = 4
+TIMEOUT = 15
+RETRIES = 1
+MAX_REDIRECTS = 5
+USER_AGENT = "academicpages-link-checker"
+REDIRECTS = {301, 302, 303, 307, 308}
+
+URL_RE = re.compile(r"""https?://[^\s<>"'`)\]]+""")
+
+def clean_url(url):
+    """Strip punctuation that ends a sentence rather than the URL"""
+    return url.rstrip(".,;:!?*")
+
+def extract_urls(root, sources=SOURCES, cv_json=CV_JSON):
+    """Map every external URL of the site to the sorted files that use it"""
+    found = {}
+
+    def add(url, path):
+        url = clean_url(url)
+        if "{{" not in url and "{%" not in url:
+            found.setdefault(url, set()).add(path)
+
+    for source in sources:
+        directory = os.path.join(root, source)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".md"):
+                with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                    for url in URL_RE.findall(f.read()):
+                        add(url, f"{source}/{name}")
+
+    cv_path = os.path.join(root, cv_json)
+    if os.path.exists(cv_path):
+        with open(cv_path, "r", encoding="utf-8") as f:
+            stack = [json.load(f)]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+            elif isinstance(value, str):
+                for url in URL_RE.findall(value):
+                    add(url, cv_json)
+
+    return {url: sorted(paths) for url, paths in sorted(found.items())}
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections, pooled and limited per host"""
+
+    def __init__(self, per_host=PER_HOST, timeout=TIMEOUT):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.idle = {}
+        self.limits = {}
+        self.ssl_context = ssl.create_default_context()
+
+    async def request(self, method, url, headers=None):
+        """Send one request and return (status, headers); bodies are discarded"""
+        parts = urlsplit(url)
+        https = parts.scheme == "https"
+        key = (parts.scheme, parts.hostname, parts.port or (443 if https else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}", f"User-Agent: {USER_AGENT}",
+                 "Accept: */*", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        limit = self.limits.setdefault(key, asyncio.Semaphore(self.per_host))
+        async with limit:
+            # A pooled connection may have been closed by the server; retry once on a fresh one
+            for attempt in range(2):
+                reused, reader, writer = await self._connection(key, https)
+                try:
+                    writer.write(payload)
+                    await writer.drain()
+                    status, response_headers = await asyncio.wait_for(read_head(reader), self.timeout)
+                    reusable = response_headers.get("connection", "").lower() != "close"
+                    if method != "HEAD" and has_body(status):
+                        reusable = await asyncio.wait_for(discard_body(reader, response_headers), self.timeout) and reusable
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if reusable:
+                    self.idle.setdefault(key, []).append((reader, writer))
+                else:
+                    writer.close()
+                return status, response_headers
+
+    async def _connection(self, key, https):
+        idle = self.idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return True, reader, writer
+            writer.close()
+        scheme, host, port = key
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=self.ssl_context if https else None), self.timeout)
+        return False, reader, writer
+
+    def close(self):
+        for connections in self.idle.values():
+            for _, writer in connections:
+                writer.close()
+        self.idle.clear()
+
+async def read_head(reader):
+    """Read a status line and headers; return (status, lowercased headers)"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    status = int(status_line.split()[1])
+    headers = {}
+    for line in header_lines:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+def has_body(status):
+    """Whether a response with this status to a non-HEAD request has a body"""
+    return status >= 200 and status not in (204, 304)
+
+async def discard_body(reader, headers):
+    """Read past a response body; return whether the connection can be reused"""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                # Trailer headers end with an empty line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return True
+            await reader.readexactly(size + 2)
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+        return True
+    # The body runs until the server closes, which a keep-alive server may never
+    # do; the connection is dropped instead of reading to EOF
+    return False
+
+def apply_maps(url, maps):
+    """Rewrite the first matching prefix of url"""
+    for prefix, replacement in maps:
+        if url.startswith(prefix):
+            return replacement + url[len(prefix):]
+    return url
+
+async def check_url(url, pool, maps=(), retries=RETRIES):
+    """Check one URL; return its cache entry"""
+    target = apply_maps(url, maps)
+    entry = {"checked": time.time()}
+    for attempt in range(retries + 1):
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                status, headers = await pool.request("HEAD", target)
+                if status >= 400:
+                    # Some servers reject or mishandle HEAD; confirm with a minimal GET
+                    status, headers = await pool.request("GET", target, {"Range": "bytes=0-0"})
+                if status in REDIRECTS and "location" in headers:
+                    target = apply_maps(urljoin(target, headers["location"]), maps)
+                    continue
+                entry.update(status=status, ok=status < 400)
+                break
+            else:
+                # Still redirecting after MAX_REDIRECTS hops, e.g. a redirect loop
+                entry.update(status=status, ok=False, error="too many redirects")
+            if target != apply_maps(url, maps):
+                entry["final_url"] = target
+            return entry
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ValueError, IndexError) as e:
+            entry.update(status=None, ok=False, error=f"{type(e).__name__}: {e}".strip(": "))
+            if attempt == retries:
+                return entry
+            await asyncio.sleep(2 ** attempt)
+
+async def check_urls(urls, maps=(), concurrency=CONCURRENCY, per_host=PER_HOST, timeout=TIMEOUT,
+                     retries=RETRIES):
+    """Check urls concurrently; return url -> cache entry"""
+    pool = ConnectionPool(per_host, timeout)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(url):
+        async with semaphore:
+            return url, await check_url(url, pool, maps, retries)
+
+    try:
+        return dict(await asyncio.gather(*(bounded(url) for url in urls)))
+    finally:
+        pool.close()
+
+def load_cache(cache_file):
+    """Load cached results, or an empty cache"""
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def is_fresh(entry, now, ttl=TTL, failure_ttl=FAILURE_TTL):
+    """Whether a cached result is still within its TTL"""
+    return now - entry.get("checked", 0) < (ttl if entry.get("ok") else failure_ttl)
+
+def check_links(root, cache_file, maps=(), concurrency=CONCURRENCY, per_host=PER_HOST, timeout=TIMEOUT,
+                retries=RETRIES, ttl=TTL, failure_ttl=FAILURE_TTL):
+    """Check the site's URLs, reusing fresh cached results.
+
+    Returns (urls, results, checked): url -> referencing files, url -> result
+    and the number of URLs actually requested.
+    """
+    urls = extract_urls(root)
+    cache = load_cache(cache_file)
+    now = time.time()
+    stale = [url for url in urls if url not in cache or not is_fresh(cache[url], now, ttl, failure_ttl)]
+    cache.update(asyncio.run(check_urls(stale, maps, concurrency, per_host, timeout, retries)))
+
+    # URLs no longer referenced are dropped from the cache
+    results = {url: cache[url] for url in urls}
+    os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+    with open(cache_file, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    return urls, results, len(stale)
+
+def main():
+    """Main function to parse arguments and report broken links"""
+    parser = argparse.ArgumentParser(description='Check the external links and image URLs of the site')
+    parser.add_argument('--root', default='.', help='Repository root (default: current directory)')
+    parser.add_argument('--cache', help=f'Result cache (default: <root>/{CACHE_FILE})')
+    parser.add_argument('--ttl', type=float, default=TTL / 86400, help='Days a working link is trusted (default: 7)')
+    parser.add_argument('--failure-ttl', type=float, default=FAILURE_TTL / 86400,
+                        help='Days before a broken link is checked again (default: 1)')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help='Requests in flight (default: 20)')
+    parser.add_argument('--per-host', type=int, default=PER_HOST, help='Connections per host (default: 4)')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help='Seconds per request (default: 15)')
+    parser.add_argument('--retries', type=int, default=RETRIES, help='Retries on network errors (default: 1)')
+    parser.add_argument('--map', action='append', default=[], metavar='PREFIX=REPLACEMENT',
+                        help='Rewrite URLs starting with PREFIX before checking them (repeatable)')
+    parser.add_argument('--report', help='Also write the broken links as JSON to this file')
+    args = parser.parse_args()
+
+    maps = [tuple(mapping.split('=', 1)) for mapping in args.map]
+    cache_file = args.cache or os.path.join(args.root, CACHE_FILE)
+    urls, results, checked = check_links(args.root, cache_file, maps, args.concurrency, args.per_host,
+                                         args.timeout, args.retries, args.ttl * 86400, args.failure_ttl * 86400)
+
+    broken = {url: dict(result, files=urls[url]) for url, result in results.items() if not result["ok"]}
+    print(f"Checked {checked} of {len(urls)} URLs ({len(urls) - checked} cached), {len(broken)} broken")
+    for url, result in broken.items():
+        print(f"  {result['status'] or result.get('error')}  {url}")
+        for path in result["files"]:
+            print(f"      in {path}")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(broken, f, indent=2)
+    raise SystemExit(1 if broken else 0)
+
+if __name__ == '__main__':
+    main()
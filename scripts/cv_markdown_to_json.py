@@ -8,57 +8,309 @@ import os
 import re
 import json
 import yaml
+import time
+import ctypes
+import ctypes.util
+import filecmp
+import itertools
+import select
+import struct
+import tempfile
 import argparse
-from datetime import datetime, date
+import cProfile
+from collections import namedtuple
+from contextlib import contextmanager
 from pathlib import Path
-import glob
+from frontmatter_index import FrontMatterIndex, DateTimeEncoder, DEFAULT_DB
 
-# Custom JSON encoder to handle date objects
-class DateTimeEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, (datetime, date)):
-            return obj.isoformat()
-        return super().default(obj)
+# Use the C-accelerated YAML loader when libyaml is available
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
-def parse_markdown_cv(md_file):
-    """Parse the markdown CV file and extract sections."""
-    with open(md_file, 'r', encoding='utf-8') as file:
-        content = file.read()
+class PhaseTimer:
+    """Record nested timing spans of a run, for --profile.
     
-    # Remove YAML front matter
-    content = re.sub(r'^---.*?---\s*', '', content, flags=re.DOTALL)
+    Each span has a name, its start and duration relative to the timer's
+    creation, its nesting depth and free-form counts (files, bytes, entries)
+    that the code being timed fills in.
+    """
     
-    # Extract sections
-    sections = {}
-    current_section = None
-    section_content = []
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.depth = 0
     
-    for line in content.split('\n'):
-        if re.match(r'^=+$', line):
-            continue
+    @contextmanager
+    def span(self, name, **counts):
+        """Time the enclosed block; yields the counts dict to fill in."""
+        record = {"name": name, "depth": self.depth, "counts": counts}
+        self.spans.append(record)
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            record["start"] = start - self.origin
+            record["duration"] = time.perf_counter() - start
+            self.depth -= 1
+    
+    def report(self):
+        """The spans as a JSON-serializable dict, durations in milliseconds."""
+        return {
+            "total_ms": round(sum(r["duration"] for r in self.spans if r["depth"] == 0) * 1000, 3),
+            "phases": [
+                {"name": r["name"], "depth": r["depth"], "start_ms": round(r["start"] * 1000, 3),
+                 "duration_ms": round(r["duration"] * 1000, 3), **r["counts"]}
+                for r in self.spans
+            ]
+        }
+    
+    def chrome_trace(self):
+        """The spans as Chrome trace events (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {"name": r["name"], "cat": "cv", "ph": "X", "pid": pid, "tid": 0,
+                 "ts": round(r["start"] * 1e6, 1), "dur": round(r["duration"] * 1e6, 1),
+                 "args": r["counts"]}
+                for r in self.spans
+            ]
+        }
+    
+    def write(self, path, fmt="json"):
+        """Write the report (fmt "json") or a Chrome trace (fmt "chrome") to path."""
+        data = self.chrome_trace() if fmt == "chrome" else self.report()
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2, cls=DateTimeEncoder)
+    
+    def print_summary(self):
+        """Print one indented line per span."""
+        for r in self.spans:
+            counts = ", ".join(f"{key}={value}" for key, value in r["counts"].items())
+            label = "  " * r["depth"] + r["name"]
+            print(f"{label:<40}{r['duration'] * 1000:>10.2f} ms  {counts}")
+
+def write_if_changed(output_file, text):
+    """Write text to output_file unless it already holds exactly that text.
+    
+    The file is replaced atomically, so readers such as a running
+    `jekyll serve` never see a half-written file.
+    """
+    if os.path.exists(output_file):
+        with open(output_file, 'r', encoding='utf-8') as file:
+            if file.read() == text:
+                return False
+    
+    output_dir = os.path.dirname(os.path.abspath(output_file))
+    fd, tmp_file = tempfile.mkstemp(dir=output_dir, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(text)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+    
+    return True
+
+# Structural lines of the markdown CV: "=" underlines (group 1) and section
+# headings, made only of letters and spaces
+STRUCTURE_LINE = re.compile(r'^(?:(=+)|[^\S\n]*[A-Za-z](?:[A-Za-z]|[^\S\n])*)$', re.MULTILINE)
+WORD_CHAR = re.compile(r'\w')
+
+class CVSection(namedtuple('CVSection', ['name', 'line', 'lines'])):
+    """A markdown CV section: its heading, the heading's line number and its
+    body as (line number, text) pairs, with surrounding blank space stripped.
+    
+    The bullet entries and "name: value" fields of the body are grouped on
+    access, since each parser only needs one of them.
+    """
+    __slots__ = ()
+    
+    @property
+    def text(self):
+        return '\n'.join(text for _, text in self.lines)
+    
+    @property
+    def entries(self):
+        return group_entries(self.lines)
+    
+    @property
+    def fields(self):
+        return group_fields(self.lines)
+
+class CVEntry(namedtuple('CVEntry', ['line', 'lines'])):
+    """A bullet entry: its line number and (line number, text) pairs, the
+    first without its "* " marker."""
+    __slots__ = ()
+    
+    @property
+    def text(self):
+        return '\n'.join(text for _, text in self.lines)
+
+class CVField(namedtuple('CVField', ['line', 'name', 'lines'])):
+    """A "name: value" field: its line number, name and the (line number,
+    text) pairs of its value, the first starting after the colon."""
+    __slots__ = ()
+    
+    @property
+    def text(self):
+        return '\n'.join(text for _, text in self.lines)
+
+EMPTY_SECTION = CVSection('', 0, ())
+
+def tokenize_cv(content):
+    """Walk the markdown CV once and return its sections as a list of CVSection.
+    
+    Lines of "=" are dropped; a line made only of letters and spaces starts
+    a section, named after it. Text before the first section is ignored, and
+    a last section without any line is left out.
+    """
+    # Remove YAML front matter: everything up to the second ---, and the blank space after it
+    first_line = 1
+    if content.startswith('---'):
+        end = content.find('---', 3)
+        if end >= 0:
+            rest = content[end + 3:].lstrip()
+            first_line += content.count('\n', 0, len(content) - len(rest))
+            content = rest
+    
+    sections = []
+    name = None
+    heading_line = 0
+    lines = []
+    # Only structural lines are matched; the body lines between them are split off in bulk
+    pos = 0
+    number = first_line
+    for match in STRUCTURE_LINE.finditer(content):
+        start = match.start()
+        if name is not None and start > pos:
+            lines.extend(zip(itertools.count(number), content[pos:start - 1].split('\n')))
+        number += content.count('\n', pos, start)
+        
+        if match.group(1) is None:
+            if name is not None:
+                sections.append(build_section(name, heading_line, lines))
+                lines = []
+            name = match.group().strip()
+            heading_line = number
         
-        section_match = re.match(r'^([A-Za-z\s]+)$', line.strip())
-        if section_match and len(line.strip()) > 0:
-            if current_section:
-                sections[current_section] = '\n'.join(section_content).strip()
-                section_content = []
-            current_section = section_match.group(1).strip()
-        elif current_section:
-            section_content.append(line)
-    
-    # Add the last section
-    if current_section and section_content:
-        sections[current_section] = '\n'.join(section_content).strip()
+        pos = match.end() + 1
+        number += 1
+    
+    if name is not None and pos <= len(content):
+        lines.extend(zip(itertools.count(number), content[pos:].split('\n')))
+    if name is not None and lines:
+        sections.append(build_section(name, heading_line, lines))
     
     return sections
 
+def build_section(name, heading_line, lines):
+    """Strip the blank space around a section body."""
+    start = 0
+    while start < len(lines) and not lines[start][1].strip():
+        start += 1
+    end = len(lines)
+    while end > start and not lines[end - 1][1].strip():
+        end -= 1
+    
+    body = lines[start:end]
+    if body:
+        body[0] = (body[0][0], body[0][1].lstrip())
+        body[-1] = (body[-1][0], body[-1][1].rstrip())
+    
+    return CVSection(name, heading_line, body)
+
+def group_entries(body):
+    """Group section lines into bullet entries.
+    
+    An entry starts after the first "* " on a line outside an entry and runs
+    until a line that starts with "*"; indented lines, including nested
+    bullets, belong to the entry. Text outside entries is ignored.
+    """
+    entries = []
+    current = None
+    for number, text in body:
+        if current is not None and text.startswith('*'):
+            current = None
+        
+        if current is not None:
+            current.lines.append((number, text))
+            continue
+        
+        marker = text.find('* ')
+        if marker >= 0:
+            current = CVEntry(number, [(number, text[marker + 2:])])
+            entries.append(current)
+    
+    return entries
+
+def group_fields(body):
+    """Group section lines into "name: value" fields.
+    
+    A field starts on a line that begins with a word character, provided a
+    colon follows somewhere; its name runs to the first colon and its value
+    over the following lines, up to the next field. The line break after a
+    colon that ends its line belongs to the value, so the first non-blank
+    line after it never starts a field.
+    """
+    # Whether any later line holds a colon, so each line is only scanned once
+    colon_after = [False] * len(body)
+    seen = False
+    for i in range(len(body) - 1, -1, -1):
+        colon_after[i] = seen
+        seen = seen or ':' in body[i][1]
+    
+    fields = []
+    current = None
+    i = 0
+    while i < len(body):
+        number, text = body[i]
+        if not (WORD_CHAR.match(text) and (':' in text or colon_after[i])):
+            if current is not None:
+                current.lines.append((number, text))
+            i += 1
+            continue
+        
+        # The name runs to the first colon, which may be on a later line
+        name_lines = []
+        while ':' not in body[i][1]:
+            name_lines.append(body[i][1])
+            i += 1
+        colon = body[i][1].index(':')
+        name_lines.append(body[i][1][:colon])
+        current = CVField(number, '\n'.join(name_lines), [(body[i][0], body[i][1][colon + 1:])])
+        fields.append(current)
+        i += 1
+        
+        if not current.lines[0][1].strip():
+            while i < len(body) and not body[i][1].strip():
+                current.lines.append(body[i])
+                i += 1
+            if i < len(body):
+                current.lines.append(body[i])
+                i += 1
+    
+    return fields
+
+def parse_markdown_cv(md_file):
+    """Parse the markdown CV file and extract sections."""
+    with open(md_file, 'r', encoding='utf-8') as file:
+        content = file.read()
+    
+    return split_markdown_sections(content)
+
+def split_markdown_sections(content):
+    """Split the markdown CV text into a dict of section name to body."""
+    return {section.name: section.text for section in tokenize_cv(content)}
+
 def parse_config(config_file):
     """Parse the Jekyll _config.yml file for additional information."""
     if not os.path.exists(config_file):
         return {}
     
     with open(config_file, 'r', encoding='utf-8') as file:
-        config = yaml.safe_load(file)
+        config = yaml.load(file, Loader=SafeLoader)
     
     return config
 
@@ -158,21 +410,24 @@ def extract_author_info(config):
     
     return author_info
 
-def parse_education(education_text):
-    """Parse education section from markdown."""
+# Patterns applied to single entries of the markdown CV
+EDUCATION_ENTRY = re.compile(r'([^,]+), ([^,]+), (\d{4})(.*)')
+GPA = re.compile(r'GPA: ([\d\.]+)')
+POSITION = re.compile(r'(.*?), (.*?)(?:, |$)')
+DATE_RANGE = re.compile(r'(\d{4})\s*-\s*(\d{4}|present)', re.IGNORECASE)
+
+def parse_education(section):
+    """Parse the education CVSection."""
     education_entries = []
     
-    # Extract education entries
-    entries = re.findall(r'\* (.*?)(?=\n\*|\Z)', education_text, re.DOTALL)
-    
-    for entry in entries:
+    for entry in section.entries:
         # Parse degree, institution, and year
-        match = re.match(r'([^,]+), ([^,]+), (\d{4})(.*)', entry.strip())
+        match = EDUCATION_ENTRY.match(entry.text.strip())
         if match:
             degree, institution, year, additional = match.groups()
             
             # Extract GPA if available
-            gpa_match = re.search(r'GPA: ([\d\.]+)', additional)
+            gpa_match = GPA.search(additional)
             gpa = gpa_match.group(1) if gpa_match else None
             
             education_entries.append({
@@ -187,27 +442,23 @@ def parse_education(education_text):
     
     return education_entries
 
-def parse_work_experience(work_text):
-    """Parse work experience section from markdown."""
+def parse_work_experience(section):
+    """Parse the work experience CVSection."""
     work_entries = []
     
-    # Extract work entries
-    entries = re.findall(r'\* (.*?)(?=\n\*|\Z)', work_text, re.DOTALL)
-    
-    for entry in entries:
-        lines = entry.strip().split('\n')
-        if not lines:
-            continue
-            
+    for entry in section.entries:
+        text = entry.text
+        lines = text.strip().split('\n')
+        
         # Parse position and company
         first_line = lines[0].strip()
-        position_match = re.match(r'(.*?), (.*?)(?:, |$)', first_line)
+        position_match = POSITION.match(first_line)
         
         if position_match:
             position, company = position_match.groups()
             
             # Extract dates if available
-            date_match = re.search(r'(\d{4})\s*-\s*(\d{4}|present)', entry, re.IGNORECASE)
+            date_match = DATE_RANGE.search(text)
             start_date = date_match.group(1) if date_match else ""
             end_date = date_match.group(2) if date_match else ""
             
@@ -229,201 +480,597 @@ def parse_work_experience(work_text):
     
     return work_entries
 
-def parse_skills(skills_text):
-    """Parse skills section from markdown."""
+def parse_skills(section):
+    """Parse the skills CVSection."""
     skills_entries = []
     
-    # Extract skill categories
-    categories = re.findall(r'(?:^|\n)(\w+.*?):\s*(.*?)(?=\n\w+.*?:|\Z)', skills_text, re.DOTALL)
-    
-    for category, skills in categories:
-        # Extract individual skills
-        skill_list = [s.strip() for s in re.split(r',|\n', skills) if s.strip()]
+    for field in section.fields:
+        # Extract individual skills, separated by commas or line breaks
+        skill_list = [s.strip() for _, line in field.lines for s in line.split(',') if s.strip()]
         
         skills_entries.append({
-            "name": category.strip(),
+            "name": field.name.strip(),
             "level": "",
             "keywords": skill_list
         })
     
     return skills_entries
 
-def parse_publications(pub_dir):
-    """Parse publications from the _publications directory."""
-    publications = []
+# Declarative mapping of Jekyll collections onto CV sections. Each entry field
+# is filled from a front matter key; "defaults" overrides the empty string
+# used when the key is missing.
+COLLECTION_SPECS = [
+    {
+        "section": "publications",
+        "directory": "_publications",
+        "fields": {
+            "name": "title",
+            "publisher": "venue",
+            "releaseDate": "date",
+            "website": "paperurl",
+            "summary": "excerpt"
+        }
+    },
+    {
+        "section": "presentations",
+        "directory": "_talks",
+        "fields": {
+            "name": "title",
+            "event": "venue",
+            "date": "date",
+            "location": "location",
+            "description": "excerpt"
+        }
+    },
+    {
+        "section": "teaching",
+        "directory": "_teaching",
+        "fields": {
+            "course": "title",
+            "institution": "venue",
+            "date": "date",
+            "role": "type",
+            "description": "excerpt"
+        }
+    },
+    {
+        "section": "portfolio",
+        "directory": "_portfolio",
+        "fields": {
+            "name": "title",
+            "category": "collection",
+            "date": "date",
+            "url": "permalink",
+            "description": "excerpt"
+        },
+        "defaults": {
+            "category": "portfolio"
+        }
+    }
+]
+
+def map_front_matter(front_matter, spec):
+    """Build a CV entry from front matter according to a collection spec."""
+    defaults = spec.get("defaults", {})
+    return {
+        field: front_matter.get(key, defaults.get(field, ''))
+        for field, key in spec["fields"].items()
+    }
+
+def scan_collections(index, specs=COLLECTION_SPECS, jobs=1, timer=None):
+    """Read every collection of specs through the front matter index.
+    
+    Returns a dict mapping each spec's section name to its list of entries,
+    in the sorted file order of the collection directory. Only files that
+    changed since they were indexed are parsed, across jobs processes.
+    """
+    timer = timer or PhaseTimer()
     
-    if not os.path.exists(pub_dir):
-        return publications
+    sections = {}
+    for spec in specs:
+        with timer.span(f"collection.{spec['section']}", directory=spec["directory"]) as counts:
+            counts["parsed"] = index.update([spec["directory"]], jobs)
+            documents = index.documents(spec["directory"])
+            sections[spec["section"]] = [
+                map_front_matter(front_matter, spec)
+                for _, front_matter in documents
+                if front_matter is not None
+            ]
+            counts["files"] = len(documents)
+    
+    return sections
+
+# Top-level key order of _data/cv.json
+CV_SECTIONS = [
+    "basics", "work", "education", "skills", "languages", "interests",
+    "references", "publications", "presentations", "teaching", "portfolio"
+]
+
+# Markdown CV sections and the functions that parse them
+MARKDOWN_PARSERS = [
+    ("work", "Work experience", parse_work_experience),
+    ("education", "Education", parse_education),
+    ("skills", "Skills", parse_skills)
+]
+
+def build_markdown_sections(md_file, timer=None):
+    """Build the CV sections that come from the markdown CV."""
+    timer = timer or PhaseTimer()
     
-    for pub_file in sorted(glob.glob(os.path.join(pub_dir, "*.md"))):
-        with open(pub_file, 'r', encoding='utf-8') as file:
+    with timer.span("markdown.read") as counts:
+        with open(md_file, 'r', encoding='utf-8') as file:
             content = file.read()
-        
-        # Extract front matter
-        front_matter_match = re.match(r'^---\s*(.*?)\s*---', content, re.DOTALL)
-        if front_matter_match:
-            front_matter = yaml.safe_load(front_matter_match.group(1))
-            
-            # Extract publication details
-            pub_entry = {
-                "name": front_matter.get('title', ''),
-                "publisher": front_matter.get('venue', ''),
-                "releaseDate": front_matter.get('date', ''),
-                "website": front_matter.get('paperurl', ''),
-                "summary": front_matter.get('excerpt', '')
-            }
-            
-            publications.append(pub_entry)
+        counts["bytes"] = len(content.encode('utf-8'))
+    
+    with timer.span("markdown.tokenize") as counts:
+        # Later sections win over earlier ones with the same name
+        sections = {section.name: section for section in tokenize_cv(content)}
+        counts["sections"] = len(sections)
     
-    return publications
+    result = {}
+    for key, title, parse in MARKDOWN_PARSERS:
+        with timer.span(f"markdown.{parse.__name__}") as counts:
+            result[key] = parse(sections.get(title, EMPTY_SECTION))
+            counts["entries"] = len(result[key])
+    
+    return result
 
-def parse_talks(talks_dir):
-    """Parse talks from the _talks directory."""
-    talks = []
+def build_config_sections(config_file, timer=None):
+    """Build the CV sections that come from the Jekyll config."""
+    timer = timer or PhaseTimer()
     
-    if not os.path.exists(talks_dir):
-        return talks
+    with timer.span("config.load"):
+        config = parse_config(config_file)
     
-    for talk_file in sorted(glob.glob(os.path.join(talks_dir, "*.md"))):
-        with open(talk_file, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        # Extract front matter
-        front_matter_match = re.match(r'^---\s*(.*?)\s*---', content, re.DOTALL)
-        if front_matter_match:
-            front_matter = yaml.safe_load(front_matter_match.group(1))
-            
-            # Extract talk details
-            talk_entry = {
-                "name": front_matter.get('title', ''),
-                "event": front_matter.get('venue', ''),
-                "date": front_matter.get('date', ''),
-                "location": front_matter.get('location', ''),
-                "description": front_matter.get('excerpt', '')
-            }
-            
-            talks.append(talk_entry)
+    # Extract languages and interests from config if available
+    with timer.span("config.extract"):
+        return {
+            "basics": extract_author_info(config),
+            "languages": config.get('languages', []),
+            "interests": config.get('interests', [])
+        }
+
+def build_collection_sections(repo_root, cache_file=None, jobs=1, specs=COLLECTION_SPECS, timer=None):
+    """Build the CV sections that come from the Jekyll collections.
+    
+    Without cache_file the front matter is indexed in memory for this run only.
+    """
+    with FrontMatterIndex(repo_root, cache_file or ":memory:") as index:
+        sections = scan_collections(index, specs, jobs, timer)
     
-    return talks
+    if cache_file:
+        print(f"Re-parsed {index.misses} changed collection files ({index.hits} unchanged)")
+    
+    return sections
 
-def parse_teaching(teaching_dir):
-    """Parse teaching from the _teaching directory."""
-    teaching = []
+class CVJsonWriter:
+    """Serialize CV sections in their canonical order, as soon as they are available.
     
-    if not os.path.exists(teaching_dir):
-        return teaching
+    Sections may be added in any order and over several calls; each one is
+    serialized once every section before it has been added, and sections
+    never added are written as empty lists on close(). The output is
+    pretty-printed exactly like json.dump(..., indent=2), or compact with
+    minify. With split, output is a directory that receives one
+    {section}.json per section, so each data file only changes (and only
+    invalidates the pages using it) when its own section does. Files are
+    replaced atomically, and only when their content changed.
+    """
     
-    for teaching_file in sorted(glob.glob(os.path.join(teaching_dir, "*.md"))):
-        with open(teaching_file, 'r', encoding='utf-8') as file:
-            content = file.read()
+    def __init__(self, output, minify=False, split=False, timer=None):
+        self.output = output
+        self.minify = minify
+        self.split = split
+        self.timer = timer or PhaseTimer()
+        self.pending = {}
+        self.position = 0
+        self.changed = []
+        self.file = None
+        self.tmp_file = None
         
-        # Extract front matter
-        front_matter_match = re.match(r'^---\s*(.*?)\s*---', content, re.DOTALL)
-        if front_matter_match:
-            front_matter = yaml.safe_load(front_matter_match.group(1))
-            
-            # Extract teaching details
-            teaching_entry = {
-                "course": front_matter.get('title', ''),
-                "institution": front_matter.get('venue', ''),
-                "date": front_matter.get('date', ''),
-                "role": front_matter.get('type', ''),
-                "description": front_matter.get('excerpt', '')
-            }
-            
-            teaching.append(teaching_entry)
+        if split:
+            os.makedirs(output, exist_ok=True)
+            single_file = output.rstrip('/\\') + '.json'
+            if os.path.exists(single_file):
+                print(f"Warning: {single_file} also exists and clashes with the split sections in Jekyll")
+        else:
+            fd, self.tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output)),
+                                                 prefix='.', suffix='.tmp')
+            self.file = os.fdopen(fd, 'w', encoding='utf-8')
+            self.file.write('{')
+    
+    def dumps(self, value):
+        if self.minify:
+            return json.dumps(value, separators=(',', ':'), cls=DateTimeEncoder)
+        return json.dumps(value, indent=2, cls=DateTimeEncoder)
     
-    return teaching
+    def add(self, sections):
+        """Add sections, serializing every one that is now next in order."""
+        self.pending.update((name, value) for name, value in sections.items() if name in CV_SECTIONS)
+        if not self.ready():
+            # Nothing to serialize yet; an empty span would only clutter the profile
+            return
+        with self.timer.span("serialize") as counts:
+            counts["sections"] = 0
+            counts["bytes"] = 0
+            while self.ready():
+                name = CV_SECTIONS[self.position]
+                counts["bytes"] += self._emit(name, self.pending.pop(name))
+                counts["sections"] += 1
+                self.position += 1
+    
+    def ready(self):
+        """Whether the next section in order has been added."""
+        return self.position < len(CV_SECTIONS) and CV_SECTIONS[self.position] in self.pending
+    
+    def _emit(self, name, value):
+        text = self.dumps(value)
+        if self.split:
+            if write_if_changed(os.path.join(self.output, f"{name}.json"), text):
+                self.changed.append(name)
+        elif self.minify:
+            text = (',' if self.position else '') + json.dumps(name) + ':' + text
+            self.file.write(text)
+        else:
+            # Nest the section one level deeper, as json.dump(cv, indent=2) would
+            text = (',' if self.position else '') + '\n  ' + json.dumps(name) + ': ' + text.replace('\n', '\n  ')
+            self.file.write(text)
+        return len(text.encode('utf-8'))
+    
+    def close(self):
+        """Write the remaining sections and finish; returns True if any file changed."""
+        self.add({name: [] for name in CV_SECTIONS[self.position:] if name not in self.pending})
+        
+        with self.timer.span("write") as counts:
+            if not self.split:
+                self.file.write('}' if self.minify else '\n}')
+                self.file.close()
+                if os.path.exists(self.output) and filecmp.cmp(self.tmp_file, self.output, shallow=False):
+                    os.unlink(self.tmp_file)
+                else:
+                    os.replace(self.tmp_file, self.output)
+                    self.changed.append(self.output)
+            counts["written"] = bool(self.changed)
+            return counts["written"]
+    
+    def abort(self):
+        """Discard a partially written output file."""
+        if self.file is not None:
+            self.file.close()
+            if os.path.exists(self.tmp_file):
+                os.unlink(self.tmp_file)
 
-def parse_portfolio(portfolio_dir):
-    """Parse portfolio items from the _portfolio directory."""
-    portfolio = []
+def write_cv_json(sections, output_file, timer=None, minify=False, split=False):
+    """Serialize the CV sections in their canonical order.
     
-    if not os.path.exists(portfolio_dir):
-        return portfolio
+    Returns True if output_file (or, with split, any section file in that
+    directory) was rewritten, False if it already held the same content.
+    """
+    writer = CVJsonWriter(output_file, minify, split, timer)
+    try:
+        writer.add(sections)
+        return writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+
+def create_cv_json(md_file, config_file, repo_root, output_file, cache_file=None, jobs=1, timer=None,
+                   minify=False, split=False, stream=False):
+    """Create a JSON CV from markdown and other repository data.
     
-    for portfolio_file in sorted(glob.glob(os.path.join(portfolio_dir, "*.md"))):
-        with open(portfolio_file, 'r', encoding='utf-8') as file:
-            content = file.read()
+    When cache_file is given, collection front matter is served from that
+    front matter index and only files whose content changed are re-parsed. With
+    jobs > 1 the remaining front matter is parsed in a process pool. Pass a
+    PhaseTimer as timer to record how long each phase takes. minify and
+    split choose the output format (see CVJsonWriter); with stream, each
+    section is serialized as soon as it has been built instead of once the
+    whole CV is.
+    """
+    timer = timer or PhaseTimer()
+    writer = CVJsonWriter(output_file, minify, split, timer)
+    sections = {}
+    
+    def collect(built):
+        sections.update(built)
+        if stream:
+            writer.add(built)
+    
+    try:
+        collect({"references": []})
+        with timer.span("config"):
+            collect(build_config_sections(config_file, timer))
+        with timer.span("markdown"):
+            collect(build_markdown_sections(md_file, timer))
+        with timer.span("collections"):
+            collect(build_collection_sections(repo_root, cache_file, jobs, timer=timer))
+        
+        if not stream:
+            writer.add(sections)
+        # Leave the output untouched if nothing changed
+        written = writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+    
+    if written:
+        print(f"Successfully converted {md_file} to {output_file}")
+    else:
+        print(f"{output_file} is up to date")
+    
+    return sections
+
+# inotify event flags from <sys/inotify.h>
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ATTRIB
+INOTIFY_EVENT = struct.Struct('iIII')
+
+class InotifyWatcher:
+    """Report changed paths under a set of directories using Linux inotify."""
+
+    def __init__(self, directories):
+        libc_name = ctypes.util.find_library('c')
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError("inotify is not available on this platform")
+        
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        
+        self.directories = {}
+        for directory in directories:
+            self.add(directory)
+
+    def add(self, directory):
+        """Start watching directory if it exists and is not watched yet."""
+        directory = os.path.abspath(directory)
+        if directory in self.directories.values() or not os.path.isdir(directory):
+            return
+        
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed on {directory}")
+        self.directories[wd] = directory
+
+    def wait(self, timeout=None):
+        """Block up to timeout seconds and return the set of changed paths."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
         
-        # Extract front matter
-        front_matter_match = re.match(r'^---\s*(.*?)\s*---', content, re.DOTALL)
-        if front_matter_match:
-            front_matter = yaml.safe_load(front_matter_match.group(1))
+        buffer = os.read(self.fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(buffer):
+            wd, _, _, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size
+            name = buffer[offset:offset + length].rstrip(b'\0')
+            offset += length
             
-            # Extract portfolio details
-            portfolio_entry = {
-                "name": front_matter.get('title', ''),
-                "category": front_matter.get('collection', 'portfolio'),
-                "date": front_matter.get('date', ''),
-                "url": front_matter.get('permalink', ''),
-                "description": front_matter.get('excerpt', '')
+            if wd in self.directories:
+                changed.add(os.path.join(self.directories[wd], os.fsdecode(name)))
+        
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Report changed paths by periodically comparing file mtimes and sizes."""
+
+    def __init__(self, directories, interval=1.0):
+        self.directories = [os.path.abspath(directory) for directory in directories]
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def add(self, directory):
+        directory = os.path.abspath(directory)
+        if directory not in self.directories:
+            self.directories.append(directory)
+
+    def _scan(self):
+        snapshot = {}
+        for directory in self.directories:
+            if not os.path.isdir(directory):
+                continue
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        # Removed between listing and stat, e.g. an editor's temporary file
+                        continue
+                    snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """Poll until something changes or timeout seconds pass."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
             }
+            self.snapshot = snapshot
+            if changed:
+                return changed
             
-            portfolio.append(portfolio_entry)
-    
-    return portfolio
-
-def create_cv_json(md_file, config_file, repo_root, output_file):
-    """Create a JSON CV from markdown and other repository data."""
-    # Parse the markdown CV
-    sections = parse_markdown_cv(md_file)
-    
-    # Parse config file
-    config = parse_config(config_file)
-    
-    # Extract author information
-    author_info = extract_author_info(config)
-    
-    # Create the JSON structure
-    cv_json = {
-        "basics": author_info,
-        "work": parse_work_experience(sections.get('Work experience', '')),
-        "education": parse_education(sections.get('Education', '')),
-        "skills": parse_skills(sections.get('Skills', '')),
-        "languages": [],
-        "interests": [],
-        "references": []
-    }
-    
-    # Add publications
-    cv_json["publications"] = parse_publications(os.path.join(repo_root, "_publications"))
-    
-    # Add talks
-    cv_json["presentations"] = parse_talks(os.path.join(repo_root, "_talks"))
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.interval, remaining))
+            else:
+                time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+def watch_cv_json(md_file, config_file, repo_root, output_file, cache_file=None, jobs=1,
+                  debounce=0.2, poll_interval=1.0, force_polling=False, minify=False, split=False):
+    """Rebuild the JSON CV whenever its sources change, until interrupted.
     
-    # Add teaching
-    cv_json["teaching"] = parse_teaching(os.path.join(repo_root, "_teaching"))
+    Bursts of events are debounced, and only the sections whose sources
+    changed are recomputed before the output is atomically rewritten. A
+    rebuild that fails, e.g. on a half-written file, is reported and the
+    output left as it was; its sources are rebuilt again with the next
+    change to any source.
+    """
+    md_file = os.path.abspath(md_file)
+    config_file = os.path.abspath(config_file) if config_file else None
+    repo_root = os.path.abspath(repo_root)
+    collection_dirs = {
+        os.path.join(repo_root, spec["directory"]): spec for spec in COLLECTION_SPECS
+    }
     
-    # Add portfolio
-    cv_json["portfolio"] = parse_portfolio(os.path.join(repo_root, "_portfolio"))
+    # Watch the parent directories, since editors often save by renaming
+    directories = {os.path.dirname(md_file), repo_root} | set(collection_dirs)
+    if config_file:
+        directories.add(os.path.dirname(config_file))
     
-    # Extract languages and interests from config if available
-    if 'languages' in config:
-        cv_json["languages"] = config.get('languages', [])
+    watcher = None
+    if not force_polling:
+        try:
+            watcher = InotifyWatcher(directories)
+        except (OSError, AttributeError) as e:
+            print(f"inotify unavailable ({e}), falling back to polling")
+    if watcher is None:
+        watcher = PollingWatcher(directories, poll_interval)
     
-    if 'interests' in config:
-        cv_json["interests"] = config.get('interests', [])
+    sections = create_cv_json(md_file, config_file, repo_root, output_file, cache_file, jobs,
+                              minify=minify, split=split)
+    print(f"Watching {len(directories)} directories for changes (Ctrl+C to stop)")
     
-    # Write the JSON to a file
-    with open(output_file, 'w', encoding='utf-8') as file:
-        json.dump(cv_json, file, indent=2, cls=DateTimeEncoder)
+    # Sources of a failed rebuild, retried with the next change
+    retry_markdown = retry_config = False
+    retry_specs = []
     
-    print(f"Successfully converted {md_file} to {output_file}")
+    try:
+        while True:
+            changed = watcher.wait()
+            
+            # Keep collecting until the burst of events goes quiet
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            
+            rebuild_markdown = md_file in changed
+            rebuild_config = config_file in changed
+            specs = []
+            for directory, spec in collection_dirs.items():
+                if directory in changed:
+                    # The collection directory itself was created or replaced
+                    watcher.add(directory)
+                    specs.append(spec)
+                elif any(os.path.dirname(path) == directory and path.endswith('.md') for path in changed):
+                    specs.append(spec)
+            
+            if not (rebuild_markdown or rebuild_config or specs):
+                continue
+            rebuild_markdown = rebuild_markdown or retry_markdown
+            rebuild_config = rebuild_config or retry_config
+            specs += [spec for spec in retry_specs if spec not in specs]
+            
+            start = time.monotonic()
+            try:
+                if rebuild_config:
+                    sections.update(build_config_sections(config_file))
+                if rebuild_markdown:
+                    sections.update(build_markdown_sections(md_file))
+                if specs:
+                    sections.update(build_collection_sections(repo_root, cache_file, jobs, specs))
+                
+                updated = write_cv_json(sections, output_file, minify=minify, split=split)
+            except Exception as e:
+                print(f"Error rebuilding {output_file}: {type(e).__name__}: {e}")
+                print("Keeping the previous output; waiting for the next change")
+                retry_markdown, retry_config, retry_specs = rebuild_markdown, rebuild_config, specs
+                continue
+            retry_markdown = retry_config = False
+            retry_specs = []
+            elapsed = (time.monotonic() - start) * 1000
+            status = "Updated" if updated else "No changes to"
+            print(f"{status} {output_file} in {elapsed:.0f} ms")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
 
 def main():
     """Main function to parse arguments and run the conversion."""
     parser = argparse.ArgumentParser(description='Convert markdown CV to JSON format')
     parser.add_argument('--input', '-i', required=True, help='Input markdown CV file')
-    parser.add_argument('--output', '-o', required=True, help='Output JSON file')
+    parser.add_argument('--output', '-o', required=True, help='Output JSON file (a directory with --split)')
     parser.add_argument('--config', '-c', help='Jekyll _config.yml file')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only re-parse collection files that changed since the last run')
+    parser.add_argument('--cache', help=f'Front matter index file (default: <repo>/{DEFAULT_DB})')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Parallel front matter parser processes (0 = one per CPU)')
+    parser.add_argument('--watch', '-w', action='store_true',
+                        help='Keep running and rebuild the changed sections whenever a source changes')
+    parser.add_argument('--poll', action='store_true',
+                        help='In watch mode, poll for changes instead of using inotify')
+    parser.add_argument('--debounce', type=float, default=0.2,
+                        help='In watch mode, seconds to wait for a burst of edits to settle')
+    parser.add_argument('--minify', action='store_true',
+                        help='Write compact JSON instead of pretty-printing it')
+    parser.add_argument('--split', action='store_true',
+                        help='Write one {section}.json per section into the --output directory, e.g. _data/cv')
+    parser.add_argument('--stream', action='store_true',
+                        help='Serialize each section as soon as it is built instead of the whole CV at the end')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='Write per-phase timings (read, parse, each collection, serialize) to FILE')
+    parser.add_argument('--profile-format', choices=['json', 'chrome'], default='json',
+                        help='Phase timing format: a JSON report or a Chrome trace (default: json)')
+    parser.add_argument('--cprofile', metavar='FILE',
+                        help='Also dump cProfile statistics of the run to FILE (read with pstats or snakeviz)')
     
     args = parser.parse_args()
     
     # Get repository root (parent directory of the input file's directory)
     repo_root = str(Path(args.input).parent.parent)
     
-    create_cv_json(args.input, args.config, repo_root, args.output)
+    # Watch mode always rebuilds incrementally
+    cache_file = None
+    if args.incremental or args.cache or args.watch:
+        cache_file = args.cache or os.path.join(repo_root, DEFAULT_DB)
+    
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    
+    if args.watch and (args.profile or args.cprofile):
+        parser.error('--profile and --cprofile cannot be combined with --watch')
+    
+    if args.watch:
+        watch_cv_json(args.input, args.config, repo_root, args.output, cache_file, jobs,
+                      debounce=args.debounce, force_polling=args.poll, minify=args.minify, split=args.split)
+        return
+    
+    timer = PhaseTimer()
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler:
+        profiler.enable()
+    try:
+        create_cv_json(args.input, args.config, repo_root, args.output, cache_file, jobs, timer,
+                       minify=args.minify, split=args.split, stream=args.stream)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+            print(f"cProfile statistics written to {args.cprofile}")
+    
+    if args.profile:
+        timer.print_summary()
+        timer.write(args.profile, args.profile_format)
+        print(f"Phase timings written to {args.profile}")
 
 if __name__ == '__main__':
     main()
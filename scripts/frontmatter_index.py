@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Shared front matter index for the Jekyll collections.
+
+A SQLite file (by default .cache/frontmatter.db) holds the parsed front
+matter of every markdown file in _posts, _publications, _talks, _teaching
+and _portfolio, keyed by the path relative to the repository root. Entries
+are refreshed incrementally: a file whose mtime and size are unchanged is
+served from the index, and a touched file whose front matter hash is
+unchanged is not re-parsed. Only the front matter block is ever read.
+
+    from frontmatter_index import FrontMatterIndex
+
+    with FrontMatterIndex(repo_root) as index:
+        index.update()
+        for path, front_matter in index.documents("_talks"):
+            ...
+        talks_with_location = index.query("_talks", has=["location"])
+"""
+
+import os
+import json
+import yaml
+import hashlib
+import sqlite3
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date
+
+# Use the C-accelerated YAML loader when libyaml is available
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+COLLECTIONS = ("_posts", "_publications", "_talks", "_teaching", "_portfolio")
+
+# Default index location, relative to the repository root
+DEFAULT_DB = os.path.join(".cache", "frontmatter.db")
+
+# Custom JSON encoder to handle date objects
+class DateTimeEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        return super().default(obj)
+
+def read_front_matter_bytes(md_file):
+    """Stream the front matter block of md_file, stopping at the closing ---.
+
+    Returns the raw bytes between the delimiters, or None if the file has no
+    front matter. The document body is never read.
+    """
+    with open(md_file, 'rb') as file:
+        if file.readline().strip() != b'---':
+            return None
+
+        lines = []
+        for line in file:
+            if line.strip() == b'---':
+                return b''.join(lines)
+            lines.append(line)
+
+    return None
+
+def parse_front_matter(raw):
+    """Parse raw front matter bytes into a dict, or None."""
+    if raw is None:
+        return None
+
+    return yaml.load(raw.decode('utf-8'), Loader=SafeLoader)
+
+def parse_front_matter_or_error(raw):
+    """Parse raw front matter bytes into (front matter, None) or (None, error)."""
+    try:
+        return parse_front_matter(raw), None
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        return None, str(e).replace('\n', ' ')
+
+def parse_front_matter_batch(raws, jobs=1, parse=parse_front_matter):
+    """Parse many front matter blocks, fanning out to a process pool if jobs > 1.
+
+    Results are returned in input order regardless of which worker parsed them.
+    """
+    if jobs <= 1 or len(raws) < 2:
+        return [parse(raw) for raw in raws]
+
+    # A few chunks per worker keeps the pool busy without pickling per file
+    chunksize = max(1, len(raws) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(parse, raws, chunksize=chunksize))
+
+def collection_files(collection_dir):
+    """List the markdown files of a collection directory in sorted order."""
+    if not os.path.isdir(collection_dir):
+        return []
+
+    with os.scandir(collection_dir) as entries:
+        names = sorted(
+            entry.name for entry in entries
+            if entry.name.endswith('.md') and not entry.name.startswith('.') and entry.is_file()
+        )
+
+    return [os.path.join(collection_dir, name) for name in names]
+
+class FrontMatterIndex:
+    """SQLite index of collection front matter keyed by path, mtime and content hash.
+
+    Front matter is stored and served in its JSON form, so dates come back
+    as ISO strings. Files whose front matter is not valid YAML are indexed as
+    None with the parser error, and reported once when they are parsed. Use
+    ":memory:" as db_file for a throwaway index.
+    """
+
+    def __init__(self, repo_root, db_file=None):
+        self.repo_root = os.path.abspath(repo_root)
+        db_file = db_file or os.path.join(self.repo_root, DEFAULT_DB)
+        if db_file != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "path TEXT PRIMARY KEY, collection TEXT, mtime_ns INTEGER, size INTEGER, "
+            "sha256 TEXT, data TEXT, error TEXT)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS documents_collection ON documents (collection)")
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def relative_path(self, md_file):
+        """Index key of a file: its path relative to the repository root."""
+        return os.path.relpath(os.path.abspath(md_file), self.repo_root).replace(os.sep, '/')
+
+    def read(self, md_files, jobs=1):
+        """Return the front matter of md_files in order, refreshing stale entries.
+
+        Files that changed since they were indexed are parsed together,
+        across jobs processes. Missing front matter is returned as None.
+        """
+        results = [None] * len(md_files)
+        pending = []
+
+        for position, md_file in enumerate(md_files):
+            path = self.relative_path(md_file)
+            stat = os.stat(md_file)
+            row = self.conn.execute(
+                "SELECT data FROM documents WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (path, stat.st_mtime_ns, stat.st_size)
+            ).fetchone()
+            if row is not None:
+                self.hits += 1
+                results[position] = json.loads(row[0])
+                continue
+
+            # Only the front matter block is hashed, so body edits never force a re-parse
+            raw = read_front_matter_bytes(md_file)
+            digest = hashlib.sha256(raw or b'').hexdigest()
+            row = self.conn.execute(
+                "SELECT data FROM documents WHERE path = ? AND sha256 = ?", (path, digest)
+            ).fetchone()
+            if row is not None:
+                # A touched but unmodified file only gets its mtime refreshed
+                self.conn.execute(
+                    "UPDATE documents SET mtime_ns = ?, size = ? WHERE path = ?",
+                    (stat.st_mtime_ns, stat.st_size, path)
+                )
+                self.hits += 1
+                results[position] = json.loads(row[0])
+                continue
+
+            pending.append((position, path, stat, digest, raw))
+
+        parsed = parse_front_matter_batch([raw for *_, raw in pending], jobs, parse_front_matter_or_error)
+        for (position, path, stat, digest, _), (front_matter, error) in zip(pending, parsed):
+            if error:
+                print(f"Skipping invalid front matter in {path}: {error}")
+            # Store the JSON form so indexed and fresh entries serialize identically
+            data = json.dumps(front_matter, cls=DateTimeEncoder)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, path.split('/', 1)[0], stat.st_mtime_ns, stat.st_size, digest, data, error)
+            )
+            self.misses += 1
+            results[position] = json.loads(data)
+
+        self.conn.commit()
+        return results
+
+    def update(self, collections=COLLECTIONS, jobs=1):
+        """Bring the given collections up to date, dropping deleted files.
+
+        Returns the number of files that had to be re-parsed.
+        """
+        misses = self.misses
+        for collection in collections:
+            md_files = collection_files(os.path.join(self.repo_root, collection))
+            self.read(md_files, jobs)
+
+            current = {self.relative_path(md_file) for md_file in md_files}
+            for (path,) in self.conn.execute(
+                "SELECT path FROM documents WHERE collection = ?", (collection,)
+            ).fetchall():
+                if path not in current:
+                    self.conn.execute("DELETE FROM documents WHERE path = ?", (path,))
+
+        self.conn.commit()
+        return self.misses - misses
+
+    def errors(self):
+        """Return (path, error) for every indexed file with invalid front matter."""
+        return self.conn.execute(
+            "SELECT path, error FROM documents WHERE error IS NOT NULL ORDER BY path"
+        ).fetchall()
+
+    def get(self, path):
+        """Return the indexed front matter of one file, or None."""
+        row = self.conn.execute(
+            "SELECT data FROM documents WHERE path = ?", (self.relative_path(path),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def documents(self, collection=None):
+        """Return (path, front matter) pairs in path order, optionally for one collection."""
+        return self.query(collection)
+
+    def query(self, collection=None, has=(), **fields):
+        """Return (path, front matter) pairs matching all conditions, in path order.
+
+        has lists front matter keys that must be present; every other keyword
+        argument requires that key to equal the given value. Documents without
+        front matter only match unconditional queries.
+        """
+        sql = "SELECT path, data FROM documents WHERE 1"
+        params = []
+        if collection is not None:
+            sql += " AND collection = ?"
+            params.append(collection)
+        for key in has:
+            sql += " AND json_type(data, ?) IS NOT NULL"
+            params.append(json_path(key))
+        for key, value in fields.items():
+            sql += " AND json_extract(data, ?) = ?"
+            params.extend([json_path(key), value])
+        sql += " ORDER BY path"
+        return [(path, json.loads(data)) for path, data in self.conn.execute(sql, params)]
+
+    def close(self):
+        """Commit and close the index."""
+        self.conn.commit()
+        self.conn.close()
+
+def json_path(key):
+    """SQLite JSON path of a top-level front matter key."""
+    return '$."' + key.replace('"', '\\"') + '"'
+
+def main():
+    """Update the index and optionally print matching documents as JSON"""
+    parser = argparse.ArgumentParser(description='Build or query the front matter index of the Jekyll collections')
+    parser.add_argument('--root', default='.', help='Repository root (default: current directory)')
+    parser.add_argument('--db', help=f'Index file (default: <root>/{DEFAULT_DB})')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Parse changed front matter in N processes (0 = one per CPU)')
+    parser.add_argument('--collection', help='Only print documents of this collection, e.g. _talks')
+    parser.add_argument('--has', action='append', default=[], help='Only print documents with this key')
+    parser.add_argument('--where', action='append', default=[], metavar='KEY=VALUE',
+                        help='Only print documents whose KEY equals VALUE')
+    parser.add_argument('--print', action='store_true', help='Print the matching documents as JSON')
+    args = parser.parse_args()
+
+    with FrontMatterIndex(args.root, args.db) as index:
+        misses = index.update(jobs=args.jobs or os.cpu_count() or 1)
+        print(f"Re-parsed {misses} changed files ({index.hits} unchanged)")
+
+        if args.print or args.collection or args.has or args.where:
+            fields = dict(condition.split('=', 1) for condition in args.where)
+            documents = index.query(args.collection, args.has, **fields)
+            print(json.dumps(dict(documents), indent=2, ensure_ascii=False))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Optimize the site images in images/ and write a manifest for the templates.
+
+Every raster image is recompressed (PNG losslessly, JPEG and WebP at the
+given quality), stripped of EXIF/XMP/text metadata and emitted in several
+widths, both in its own format and as WebP. Outputs go to images/optimized/
+and are named after the source content hash, so they can be cached forever.
+
+_data/images.json maps each source path (relative to images/) to its size,
+the smallest full-size fallback and the variants per format. The manifest is
+also the cache: an image whose content hash and settings are unchanged and
+whose outputs exist is skipped. _includes/responsive-image.html reads it to
+render a <picture> with srcset, falling back to the original when an image
+has no entry.
+"""
+
+import os
+import io
+import json
+import tempfile
+import fnmatch
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageOps
+
+OUTPUT_DIR = "optimized"
+MANIFEST_FILE = "_data/images.json"
+WIDTHS = (180, 360, 720, 1200, 1800)
+QUALITY = 82
+# Downscaled widths closer than this to the original are not worth a variant
+MIN_STEP = 16
+EXTENSIONS = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG", ".webp": "WEBP"}
+# Icons are referenced at fixed sizes, and posts/ is the image_mirror.py store
+EXCLUDE = ("optimized/*", "posts/*", "favicon*", "apple-touch-icon*")
+
+def find_images(images_dir, exclude=EXCLUDE):
+    """Return the sorted raster images below images_dir, relative to it"""
+    images = []
+    for root, dirs, files in os.walk(images_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in files:
+            rel_path = os.path.relpath(os.path.join(root, name), images_dir).replace(os.sep, "/")
+            if os.path.splitext(name)[1].lower() not in EXTENSIONS:
+                continue
+            if any(fnmatch.fnmatch(rel_path, pattern) for pattern in exclude):
+                continue
+            images.append(rel_path)
+    return sorted(images)
+
+def file_digest(path):
+    """SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def settings_key(widths, quality, lossless):
+    """Identify the settings an entry was built with"""
+    return f"{','.join(map(str, widths))};q{quality};{'lossless' if lossless else 'lossy'};step{MIN_STEP}"
+
+def encode(image, fmt, quality, lossless, icc_profile):
+    """Encode image without metadata (except the colour profile); return bytes"""
+    options = {}
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+    if fmt == "PNG":
+        options["optimize"] = True
+    elif fmt == "JPEG":
+        options.update(quality=quality, optimize=True, progressive=True)
+    elif fmt == "WEBP":
+        options.update(quality=100 if lossless else quality, lossless=lossless, method=6)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **options)
+    return buffer.getvalue()
+
+def optimize_image(args):
+    """Build all outputs of one image; runs in a worker process.
+
+    Returns the manifest entry for the image.
+    """
+    images_dir, rel_path, digest, widths, quality, lossless = args
+    source = os.path.join(images_dir, rel_path)
+    fmt = EXTENSIONS[os.path.splitext(rel_path)[1].lower()]
+    ext = "jpg" if fmt == "JPEG" else fmt.lower()
+    stem = os.path.splitext(os.path.basename(rel_path))[0]
+    prefix = f"{OUTPUT_DIR}/{stem}-{digest[:10]}"
+
+    with Image.open(source) as image:
+        icc_profile = image.info.get("icc_profile")
+        # Apply the EXIF orientation before the EXIF block is dropped
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA", "L", "LA"):
+            image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+        if fmt == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+        width, height = image.size
+
+        # WebP sources already get their WebP variants from the first pass
+        outputs = [(fmt, ext)] if fmt == "WEBP" else [(fmt, ext), ("WEBP", "webp")]
+        variants = {variant_fmt.lower(): [] for variant_fmt, _ in outputs}
+        # Largest first, so each downscaled variant can be checked against the next larger one
+        for w in sorted({w for w in widths if w <= width - MIN_STEP} | {width}, reverse=True):
+            resized = image if w == width else image.resize(
+                (w, max(1, round(height * w / width))), Image.LANCZOS)
+            for variant_fmt, variant_ext in outputs:
+                data = encode(resized, variant_fmt, quality, lossless, icc_profile)
+                if variant_fmt == fmt and w == width and len(data) >= os.path.getsize(source):
+                    # Recompression did not help; keep the original bytes
+                    with open(source, "rb") as f:
+                        data = f.read()
+                kept = variants[variant_fmt.lower()]
+                if kept and len(data) >= kept[-1]["bytes"]:
+                    # Not smaller than the next larger variant, which browsers can use instead
+                    continue
+                src = f"{prefix}-{w}.{variant_ext}"
+                write_bytes(os.path.join(images_dir, src), data)
+                kept.append({"width": w, "src": src, "bytes": len(data)})
+
+    variants = {key: value[::-1] for key, value in variants.items() if value}
+    fallback = variants[fmt.lower()][-1]
+    return {
+        "sha256": digest,
+        "settings": settings_key(widths, quality, lossless),
+        "width": width,
+        "height": height,
+        "bytes": os.path.getsize(source),
+        "src": fallback["src"],
+        "type": f"image/{fmt.lower()}",
+        "variants": variants,
+    }
+
+def write_bytes(path, data):
+    """Write data to path unless it already holds exactly that"""
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def outputs_exist(entry, images_dir):
+    """Check that every file named in a manifest entry is on disk"""
+    return all(os.path.exists(os.path.join(images_dir, variant["src"]))
+               for variants in entry.get("variants", {}).values() for variant in variants)
+
+def load_manifest(manifest_file):
+    """Load the image manifest, or an empty one"""
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def prune_outputs(images_dir, manifest):
+    """Remove files in the output directory that no manifest entry uses"""
+    used = {variant["src"] for entry in manifest.values()
+            for variants in entry["variants"].values() for variant in variants}
+    output_dir = os.path.join(images_dir, OUTPUT_DIR)
+    removed = 0
+    for name in os.listdir(output_dir):
+        if f"{OUTPUT_DIR}/{name}" not in used:
+            os.remove(os.path.join(output_dir, name))
+            removed += 1
+    return removed
+
+def optimize_images(images_dir, manifest_file, widths=WIDTHS, quality=QUALITY, lossless=False,
+                    jobs=1, exclude=EXCLUDE):
+    """Optimize every image below images_dir and update the manifest.
+
+    Returns a dict with the number of images "optimized", "cached" and of
+    stale outputs "removed".
+    """
+    os.makedirs(os.path.join(images_dir, OUTPUT_DIR), exist_ok=True)
+    previous = load_manifest(manifest_file)
+    settings = settings_key(widths, quality, lossless)
+
+    manifest = {}
+    tasks = []
+    for rel_path in find_images(images_dir, exclude):
+        digest = file_digest(os.path.join(images_dir, rel_path))
+        entry = previous.get(rel_path)
+        # Reuse entries whose source and settings are unchanged
+        if entry and entry["sha256"] == digest and entry["settings"] == settings and outputs_exist(entry, images_dir):
+            manifest[rel_path] = entry
+        else:
+            tasks.append((images_dir, rel_path, digest, widths, quality, lossless))
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(optimize_image, tasks))
+    else:
+        results = [optimize_image(task) for task in tasks]
+    for task, entry in zip(tasks, results):
+        manifest[task[1]] = entry
+
+    manifest = dict(sorted(manifest.items()))
+    # The manifest is only rewritten when an entry changed
+    text = json.dumps(manifest, indent=2) + "\n"
+    if load_manifest(manifest_file) != manifest:
+        with open(manifest_file, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    return {"optimized": len(tasks), "cached": len(manifest) - len(tasks),
+            "removed": prune_outputs(images_dir, manifest)}
+
+def main():
+    """Main function to handle command line arguments"""
+    parser = argparse.ArgumentParser(description='Optimize site images and write a responsive image manifest')
+    parser.add_argument('--images', default='images', help='Image directory (default: images)')
+    parser.add_argument('--manifest', default=MANIFEST_FILE, help=f'Manifest file (default: {MANIFEST_FILE})')
+    parser.add_argument('--widths', default=','.join(map(str, WIDTHS)),
+                        help='Comma separated variant widths in pixels')
+    parser.add_argument('--quality', type=int, default=QUALITY, help='JPEG/WebP quality (default: 82)')
+    parser.add_argument('--lossless', action='store_true', help='Encode WebP variants losslessly')
+    parser.add_argument('--exclude', action='append', default=list(EXCLUDE),
+                        help='Glob of image paths to skip, relative to the image directory (repeatable)')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Worker processes (default: 0, one per CPU)')
+    args = parser.parse_args()
+
+    widths = tuple(sorted({int(w) for w in args.widths.split(',') if w}))
+    result = optimize_images(args.images, args.manifest, widths, args.quality, args.lossless,
+                             args.jobs or os.cpu_count() or 1, tuple(args.exclude))
+    print(f"Optimized {result['optimized']} images ({result['cached']} cached), "
+          f"removed {result['removed']} stale outputs; manifest at {args.manifest}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Precompute related posts from TF-IDF similarity of post bodies and tags.
+
+Each post is reduced to term counts with the tokenizer of the search index
+(ASCII words and CJK bigrams), with title terms weighted TITLE_WEIGHT times
+and tags TAG_WEIGHT times. The counts become a TF-IDF matrix (sublinear term
+frequency, smoothed IDF, L2-normalized rows), and cosine similarities are
+computed as matrix products over blocks of rows, keeping the top k
+neighbours of every post. The result is written to _data/related.json,
+mapping each post path to its related post paths and scores, for
+_layouts/single.html to use instead of Jekyll's related_posts.
+
+The per-post term counts are cached in a state file keyed by the SHA-256 of
+each post, so only new or changed posts are re-tokenized; since IDF weights
+depend on every post, the (cheap) matrix product is then redone, and
+_data/related.json is only rewritten when its content changes. Nothing is
+recomputed at all when no post changed.
+
+scipy.sparse is used for the matrix when installed; otherwise a dense NumPy
+matrix is used, which is fine for a personal site's posts.
+"""
+
+import os
+import json
+import hashlib
+import argparse
+import numpy as np
+from build_search_index import strip_markup, tokenize, write_json_if_changed, TITLE_WEIGHT
+from frontmatter_index import FrontMatterIndex, collection_files, DEFAULT_DB
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+COLLECTION = "_posts"
+OUTPUT_FILE = os.path.join("_data", "related.json")
+STATE_FILE = os.path.join(".cache", "related.json")
+STATE_VERSION = 1
+TAG_WEIGHT = 2
+TOP_K = 4
+BLOCK_SIZE = 512
+
+def post_terms(raw, front_matter):
+    """Count the terms of a post, weighting title and tag terms"""
+    front_matter = front_matter or {}
+    counts = {}
+
+    def add(text, weight):
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + weight
+
+    add(strip_markup(raw.decode("utf-8")), 1)
+    add(str(front_matter.get("title") or ""), TITLE_WEIGHT)
+    tags = front_matter.get("tags") or []
+    for tag in tags if isinstance(tags, list) else [tags]:
+        add(str(tag), TAG_WEIGHT)
+    return counts
+
+def tfidf_matrix(documents):
+    """Build the L2-normalized TF-IDF matrix of a list of term count dicts"""
+    vocabulary = {}
+    rows, cols, counts = [], [], []
+    for row, terms in enumerate(documents):
+        for term, count in terms.items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+    rows = np.array(rows, dtype=np.int64)
+    cols = np.array(cols, dtype=np.int64)
+
+    n_docs = len(documents)
+    doc_freq = np.bincount(cols, minlength=len(vocabulary))
+    idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+    values = (1 + np.log(np.array(counts, dtype=np.float64))) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=n_docs))
+    values /= norms[rows]
+
+    shape = (n_docs, len(vocabulary))
+    if sparse is not None:
+        return sparse.csr_matrix((values, (rows, cols)), shape=shape)
+    matrix = np.zeros(shape)
+    matrix[rows, cols] = values
+    return matrix
+
+def top_neighbours(matrix, k=TOP_K, block_size=BLOCK_SIZE):
+    """Return the k most similar other rows of every row as (index, score) lists"""
+    n_docs = matrix.shape[0]
+    k = min(k, n_docs - 1)
+    if k <= 0:
+        return [[] for _ in range(n_docs)]
+
+    transposed = matrix.T
+    neighbours = []
+    for start in range(0, n_docs, block_size):
+        stop = min(start + block_size, n_docs)
+        similarities = matrix[start:stop] @ transposed
+        if sparse is not None and sparse.issparse(similarities):
+            similarities = similarities.toarray()
+        # A post is never related to itself
+        similarities[np.arange(stop - start), np.arange(start, stop)] = -1
+        candidates = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        for offset, row in enumerate(candidates):
+            scores = similarities[offset]
+            ranked = sorted(row, key=lambda j: (-scores[j], j))
+            neighbours.append([(int(j), float(scores[j])) for j in ranked if scores[j] > 0])
+    return neighbours
+
+def load_state(state_file):
+    """Load the incremental state, discarding it if written by another version"""
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        state = {}
+    if state.get("version") != STATE_VERSION:
+        state = {"version": STATE_VERSION, "documents": {}}
+    return state
+
+def build_related_posts(repo_root, output_file, state_file, k=TOP_K, index_file=None):
+    """Update output_file with the related posts of every post.
+
+    Returns a dict with the number of posts "tokenized", "unchanged" and
+    "removed", and whether the output was "written".
+    """
+    state = load_state(state_file)
+    previous = state["documents"]
+    documents = {}
+    stats = {"tokenized": 0, "unchanged": 0}
+
+    md_files = collection_files(os.path.join(repo_root, COLLECTION))
+    with FrontMatterIndex(repo_root, index_file or ":memory:") as index:
+        front_matters = index.read(md_files)
+        paths = [index.relative_path(md_file) for md_file in md_files]
+
+    for path, md_file, front_matter in zip(paths, md_files, front_matters):
+        with open(md_file, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+
+        entry = previous.get(path)
+        if entry and entry["sha256"] == digest:
+            documents[path] = entry
+            stats["unchanged"] += 1
+        else:
+            documents[path] = {"sha256": digest, "terms": post_terms(raw, front_matter)}
+            stats["tokenized"] += 1
+    stats["removed"] = len(set(previous) - set(documents))
+
+    unchanged = stats["tokenized"] == 0 and stats["removed"] == 0 and state.get("k") == k
+    if unchanged and os.path.exists(output_file):
+        stats["written"] = False
+        return stats
+
+    related = {}
+    if documents:
+        paths = sorted(documents)
+        neighbours = top_neighbours(tfidf_matrix([documents[path]["terms"] for path in paths]), k)
+        for path, row in zip(paths, neighbours):
+            related[path] = [{"path": paths[j], "score": round(score, 4)} for j, score in row]
+    stats["written"] = write_json_if_changed(output_file, related)
+
+    state.update(k=k, documents=documents)
+    os.makedirs(os.path.dirname(os.path.abspath(state_file)), exist_ok=True)
+    with open(state_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    return stats
+
+def main():
+    """Main function to parse arguments and build the related posts"""
+    parser = argparse.ArgumentParser(description='Precompute related posts from TF-IDF similarity')
+    parser.add_argument('--root', default='.', help='Repository root (default: current directory)')
+    parser.add_argument('--output', '-o', help=f'Output file (default: <root>/{OUTPUT_FILE})')
+    parser.add_argument('--state', help=f'Incremental state file (default: <root>/{STATE_FILE})')
+    parser.add_argument('--index', help=f'Front matter index file (default: <root>/{DEFAULT_DB}, "" for none)')
+    parser.add_argument('-k', type=int, default=TOP_K, help='Related posts per post (default: 4)')
+    args = parser.parse_args()
+
+    output_file = args.output or os.path.join(args.root, OUTPUT_FILE)
+    state_file = args.state or os.path.join(args.root, STATE_FILE)
+    index_file = os.path.join(args.root, DEFAULT_DB) if args.index is None else args.index
+    stats = build_related_posts(args.root, output_file, state_file, args.k, index_file)
+    print(f"Tokenized {stats['tokenized']} posts ({stats['unchanged']} unchanged, {stats['removed']} removed); "
+          f"{'wrote' if stats['written'] else 'kept'} {output_file}")
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 #!/bin/bash
 
 # Script to update the CV JSON file from the markdown CV
+# Usage: update_cv_json.sh [--watch | --profile]
 # Author: Yuan Chen
 
 # Set the base directory to the repository root
@@ -24,9 +25,25 @@ if [ ! -f "$CV_MARKDOWN" ]; then
   exit 1
 fi
 
+# With --watch, keep regenerating the JSON as the sources change (for use
+# alongside a running `jekyll serve`)
+if [ "$1" == "--watch" ]; then
+  echo "Watching markdown CV sources for changes..."
+  exec python3 "$PYTHON_SCRIPT" --input "$CV_MARKDOWN" --output "$CV_JSON" --config "$CONFIG_FILE" --watch
+fi
+
+# With --profile, report where the time goes: phase timings as a Chrome trace
+# and a cProfile dump, both under .cache/
+PROFILE_ARGS=()
+if [ "$1" == "--profile" ]; then
+  mkdir -p "$BASE_DIR/.cache"
+  PROFILE_ARGS=(--profile "$BASE_DIR/.cache/cv_profile.trace.json" --profile-format chrome
+                --cprofile "$BASE_DIR/.cache/cv_profile.pstats")
+fi
+
 # Run the Python script to convert markdown to JSON
 echo "Converting markdown CV to JSON..."
-python3 "$PYTHON_SCRIPT" --input "$CV_MARKDOWN" --output "$CV_JSON" --config "$CONFIG_FILE"
+python3 "$PYTHON_SCRIPT" --input "$CV_MARKDOWN" --output "$CV_JSON" --config "$CONFIG_FILE" --incremental "${PROFILE_ARGS[@]}"
 
 # Check if the conversion was successful
 if [ $? -eq 0 ]; then
@@ -1,56 +1,611 @@
 # Leaflet cluster map of talk locations
 #
-# Run this from the _talks/ directory, which contains .md files of all your
-# talks. This scrapes the location YAML field from each .md file, geolocates it
-# with geopy/Nominatim, and uses the getorg library to output data, HTML, and
-# Javascript for a standalone cluster map. This is functionally the same as the
-# #talkmap Jupyter notebook.
-import frontmatter
+# Run this from the repository root, which contains the _talks/ directory of
+# .md files of all your talks. This scrapes the location YAML field from each
+# .md file, geolocates it with geopy/Nominatim, and writes the addressPoints
+# data (talkmap/org-locations.js) for the standalone cluster map in
+# talkmap/map.html. This is functionally the same as the #talkmap Jupyter
+# notebook.
+#
+# Talk front matter is read through the shared front matter index
+# (scripts/frontmatter_index.py, .cache/frontmatter.db by default), so only
+# talks edited since the last run are parsed.
+#
+# The map is updated incrementally: existing points are matched to talks by
+# file and location, so only new or moved talks are geocoded, points of
+# deleted talks are dropped, and org-locations.js is only rewritten when its
+# content changes.
+#
+# Geocoding results are kept in talkmap/geocode_cache.json, keyed by the
+# normalized location string, so venues that were already resolved are not
+# looked up again. Each distinct location is geocoded at most once per run.
+# For offline runs (and tests), point --backend gazetteer at a local JSON or
+# TSV file of locations, or point --nominatim-url at a stub server.
+#
+# Cache misses are geocoded concurrently (--workers) behind a token bucket
+# (--rate) that keeps us within the provider's usage policy. Timeouts are
+# retried with exponential backoff, and locations that still fail are listed
+# in a report at the end of the run (--failures saves it as JSON).
+#
+# For large archives, --geojson also writes the points as GeoJSON, and
+# --tiles writes grid clusters precomputed per zoom level, split into map
+# tiles under talkmap/clusters/. talkmap/map-tiled.html loads only the tiles
+# covering the current viewport instead of the whole addressPoints array.
+import argparse
+import csv
 import glob
-import getorg
-from geopy import Nominatim
-from geopy.exc import GeocoderTimedOut
+import json
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Talk front matter comes from the shared index in scripts/frontmatter_index.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from frontmatter_index import DEFAULT_DB, FrontMatterIndex
+
+try:
+    from geopy import Nominatim
+    from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
+except ImportError:
+    # geopy is only needed for the Nominatim backend
+    Nominatim = None
+    GeocoderTimedOut = GeocoderUnavailable = TimeoutError
 
 # Set the default timeout, in seconds
 TIMEOUT = 5
 
-# Collect the Markdown files
-g = glob.glob("_talks/*.md")
-
-# Prepare to geolocate
-geocoder = Nominatim(user_agent="academicpages.github.io")
-location_dict = {}
-location = ""
-permalink = ""
-title = ""
-
-# Perform geolocation
-for file in g:
-    # Read the file
-    data = frontmatter.load(file)
-    data = data.to_dict()
-
-    # Press on if the location is not present
-    if 'location' not in data:
-        continue
-
-    # Prepare the description
-    title = data['title'].strip()
-    venue = data['venue'].strip()
-    location = data['location'].strip()
-    description = f"{title}<br />{venue}; {location}"
-
-    # Geocode the location and report the status
+# Concurrency and rate limits for cache misses; the public Nominatim usage
+# policy allows at most one request per second
+WORKERS = 4
+RATE = 1.0
+
+# Transient errors are retried with exponential backoff, in seconds
+RETRIES = 3
+BACKOFF = 1.0
+RETRYABLE_ERRORS = (GeocoderTimedOut, GeocoderUnavailable)
+
+# Geocode cache location and expiry; failed lookups are retried sooner
+CACHE_FILE = "talkmap/geocode_cache.json"
+CACHE_TTL = 180 * 24 * 3600
+NEGATIVE_CACHE_TTL = 7 * 24 * 3600
+CACHE_MAX_ENTRIES = 10000
+
+# Pre-clustered tile index: Leaflet's 256 pixel tiles, grid cells matching
+# the maxClusterRadius of map.html, and the Web Mercator latitude limit
+TILE_SIZE = 256
+CELL_SIZE = 80
+MAX_ZOOM = 18
+MAX_LATITUDE = 85.0511287798
+
+# A geocoded location
+Place = namedtuple("Place", ["address", "latitude", "longitude"])
+
+
+def normalize_location(location):
+    """Normalize a location string for use as a cache key."""
+    location = location.casefold().strip()
+    location = re.sub(r"\s*,\s*", ", ", location)
+    return re.sub(r"\s+", " ", location)
+
+
+class GeocodeCache:
+    """Persistent JSON store of geocoding results with TTL and LRU eviction."""
+
+    def __init__(self, path, ttl=CACHE_TTL, negative_ttl=NEGATIVE_CACHE_TTL,
+                 max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.entries = {}
+        self.dirty = False
+
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("entries", {})
+
+    def get(self, key, now=None):
+        """Return (True, place) on a fresh hit, (False, None) otherwise.
+
+        A cached place of None means the location is known not to resolve.
+        """
+        now = time.time() if now is None else now
+        entry = self.entries.get(key)
+        if entry is None:
+            return False, None
+
+        ttl = self.ttl if entry["latitude"] is not None else self.negative_ttl
+        if now - entry["updated"] > ttl:
+            return False, None
+
+        entry["used"] = now
+        if entry["latitude"] is None:
+            return True, None
+        return True, Place(entry["address"], entry["latitude"], entry["longitude"])
+
+    def put(self, key, place, now=None):
+        """Record a geocoding result, or None for a location that did not resolve."""
+        now = time.time() if now is None else now
+        self.entries[key] = {
+            "address": place.address if place else None,
+            "latitude": place.latitude if place else None,
+            "longitude": place.longitude if place else None,
+            "updated": now,
+            "used": now,
+        }
+        self.dirty = True
+
+    def evict(self, now=None):
+        """Drop expired entries, then the least recently used beyond max_entries."""
+        now = time.time() if now is None else now
+        for key, entry in list(self.entries.items()):
+            ttl = self.ttl if entry["latitude"] is not None else self.negative_ttl
+            if now - entry["updated"] > ttl:
+                del self.entries[key]
+                self.dirty = True
+
+        if len(self.entries) > self.max_entries:
+            by_use = sorted(self.entries, key=lambda k: self.entries[k]["used"])
+            for key in by_use[:len(self.entries) - self.max_entries]:
+                del self.entries[key]
+            self.dirty = True
+
+    def save(self):
+        """Write the cache back to disk if a result was added or evicted."""
+        if not self.path or not self.dirty:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self.entries}, f, indent=2,
+                      sort_keys=True, ensure_ascii=False)
+            f.write("\n")
+        self.dirty = False
+
+
+class NominatimBackend:
+    """Geocode through Nominatim, or any server speaking its API (e.g. a local stub)."""
+
+    def __init__(self, url=None, timeout=TIMEOUT, user_agent="academicpages.github.io"):
+        if Nominatim is None:
+            raise ImportError("the nominatim backend requires geopy (pip install geopy)")
+
+        options = {"user_agent": user_agent}
+        if url:
+            scheme, _, domain = url.partition("://")
+            options.update(scheme=scheme, domain=domain.rstrip("/"))
+        self.geocoder = Nominatim(**options)
+        self.timeout = timeout
+
+    def geocode(self, location):
+        result = self.geocoder.geocode(location, timeout=self.timeout)
+        if result is None:
+            return None
+        return Place(result.address, result.latitude, result.longitude)
+
+
+class GazetteerBackend:
+    """Geocode from a local gazetteer file, with no network access.
+
+    The file is either a JSON object mapping locations to [latitude,
+    longitude] (or {"latitude", "longitude", "address"}), or a TSV with
+    location, latitude and longitude columns.
+    """
+
+    def __init__(self, path):
+        self.places = {}
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".json"):
+                rows = json.load(f).items()
+            else:
+                rows = ((row[0], row[1:]) for row in csv.reader(f, delimiter="\t") if row)
+
+            for location, value in rows:
+                if isinstance(value, dict):
+                    place = Place(value.get("address", location), float(value["latitude"]),
+                                  float(value["longitude"]))
+                else:
+                    try:
+                        place = Place(location, float(value[0]), float(value[1]))
+                    except ValueError:
+                        # Header row
+                        continue
+                self.places[normalize_location(location)] = place
+
+    def geocode(self, location):
+        return self.places.get(normalize_location(location))
+
+
+def load_talks(pattern="_talks/*.md", index_file=None):
+    """Return (file, description, location) for every talk with a location.
+
+    Front matter is read through the front matter index at index_file, so
+    only talks that changed since the last run are parsed. Without an index
+    file it is parsed in memory.
+    """
+    files = sorted(glob.glob(pattern))
+    with FrontMatterIndex(".", index_file or ":memory:") as index:
+        front_matters = index.read(files)
+
+    talks = []
+    for file, data in zip(files, front_matters):
+        # Press on if the location is not present
+        if not data or 'location' not in data:
+            continue
+
+        # Prepare the description
+        title = data['title'].strip()
+        venue = data['venue'].strip()
+        location = data['location'].strip()
+        talks.append((file, f"{title}<br />{venue}; {location}", location))
+    return talks
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting requests to rate per second."""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# A location that could not be geocoded, for the failure report
+Failure = namedtuple("Failure", ["location", "error", "message", "attempts"])
+
+
+def geocode_with_retry(backend, location, bucket=None, retries=RETRIES, backoff=BACKOFF):
+    """Geocode one location, retrying transient errors with exponential backoff.
+
+    Returns (place, attempts); the last error is re-raised once retries run out.
+    """
+    for attempt in range(retries + 1):
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            return backend.geocode(location), attempt + 1
+        except RETRYABLE_ERRORS as ex:
+            if attempt == retries:
+                ex.attempts = attempt + 1
+                raise
+            time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+def geocode_locations(locations, backend, cache=None, workers=WORKERS, rate=RATE,
+                      retries=RETRIES, backoff=BACKOFF):
+    """Geocode each distinct location once, consulting the cache first.
+
+    Cache misses are geocoded by up to workers threads, sharing a token
+    bucket of rate requests per second. Returns (places, failures), where
+    places maps normalized locations to a Place, or None for locations that
+    did not resolve or failed, and failures lists the Failure of each
+    location that raised an error.
+    """
+    results = {}
+    pending = {}
+    for location in locations:
+        key = normalize_location(location)
+        if key in results or key in pending:
+            continue
+
+        if cache is not None:
+            hit, place = cache.get(key)
+            if hit:
+                results[key] = place
+                continue
+
+        pending[key] = location
+
+    failures = []
+    bucket = TokenBucket(rate) if rate else None
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(geocode_with_retry, backend, location, bucket, retries, backoff): key
+            for key, location in pending.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            location = pending[key]
+            results[key] = None
+
+            # Geocode the location and report the status
+            try:
+                results[key], _ = future.result()
+                if cache is not None:
+                    cache.put(key, results[key])
+            except ValueError as ex:
+                failures.append(Failure(location, "failed", str(ex), 1))
+            except GeocoderTimedOut as ex:
+                failures.append(Failure(location, "timed out", str(ex), getattr(ex, "attempts", 1)))
+            except Exception as ex:
+                failures.append(Failure(location, type(ex).__name__, str(ex), getattr(ex, "attempts", 1)))
+
+    failures.sort(key=lambda failure: failure.location)
+    return results, failures
+
+
+def report_failures(failures, path=None):
+    """Print the per-location failure report, and optionally save it as JSON."""
+    if failures:
+        print(f"Error: {len(failures)} location(s) could not be geocoded:")
+        for failure in failures:
+            print(f"  {failure.location}: {failure.error} after {failure.attempts} attempt(s) "
+                  f"with message {failure.message}")
+
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([failure._asdict() for failure in failures], f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+def read_address_points(path):
+    """Read the addressPoints array of an existing org-locations.js, if any."""
+    if not os.path.exists(path):
+        return []
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read().strip()
     try:
-        location_dict[description] = geocoder.geocode(location, timeout=TIMEOUT)
-        print(description, location_dict[description])
-    except ValueError as ex:
-        print(f"Error: geocode failed on input {location} with message {ex}")
-    except GeocoderTimedOut as ex:
-        print(f"Error: geocode timed out on input {location} with message {ex}")
-    except Exception as ex:
-        print(f"An unhandled exception occurred while processing input {location} with message {ex}")
-
-# Save the map
-m = getorg.orgmap.create_map_obj()
-getorg.orgmap.output_html_cluster_map(location_dict, folder_name="talkmap", hashed_usernames=False)
+        return json.loads(text[text.index("["):text.rindex("]") + 1])
+    except ValueError:
+        print(f"Warning: could not read {path}, rebuilding all points")
+        return []
+
+
+def render_address_points(points):
+    """Render points in the org-locations.js format that map.html loads."""
+    return "var addressPoints = " + json.dumps(points, indent=2) + ";"
+
+
+def diff_address_points(talks, existing):
+    """Match talks against existing points, keyed by talk file and location.
+
+    Each point is [description, latitude, longitude, file, location]; the
+    extra fields are ignored by map.html. Points written before they were
+    tracked carry only the first three and are matched by description.
+    Returns (points, unresolved, stats): points holds one entry per talk in
+    talk order, with None where the talk still needs geocoding.
+    """
+    by_key = {}
+    by_description = {}
+    for point in existing:
+        if len(point) >= 5:
+            by_key[(point[3], normalize_location(point[4]))] = point
+        else:
+            by_description[point[0]] = point
+
+    points = []
+    unresolved = []
+    matched = set()
+    stats = {"added": 0, "changed": 0, "unchanged": 0}
+    for file, description, location in talks:
+        old = by_key.get((file, normalize_location(location))) or by_description.get(description)
+        if old is not None:
+            points.append([description, old[1], old[2], file, location])
+            stats["unchanged" if list(old) == points[-1] else "changed"] += 1
+            matched.add(id(old))
+        else:
+            points.append(None)
+            unresolved.append(location)
+            stats["added"] += 1
+
+    # Points of deleted talks are dropped
+    stats["removed"] = sum(1 for point in existing if id(point) not in matched)
+    return points, unresolved, stats
+
+
+def write_if_changed(path, text):
+    """Write text to path only if its content differs. Returns True if written."""
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # Write a temporary file and rename it, so an interrupted run never leaves a truncated file
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def render_geojson(points):
+    """Render points as a GeoJSON FeatureCollection."""
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [longitude, latitude]},
+            "properties": {"title": description, "file": file, "location": location},
+        }
+        for description, latitude, longitude, file, location in points
+    ]
+    return json.dumps({"type": "FeatureCollection", "features": features}, indent=2)
+
+
+def project(latitude, longitude, zoom):
+    """Project to Web Mercator pixel coordinates at zoom, as Leaflet does."""
+    size = TILE_SIZE * 2 ** zoom
+    latitude = max(-MAX_LATITUDE, min(MAX_LATITUDE, latitude))
+    sin = math.sin(math.radians(latitude))
+    x = (longitude + 180) / 360 * size
+    y = (0.5 - math.log((1 + sin) / (1 - sin)) / (4 * math.pi)) * size
+    return x, y
+
+
+def cluster_points(points, zoom, cell_size=CELL_SIZE):
+    """Group points into grid clusters of cell_size pixels at zoom.
+
+    Returns a dict mapping tile (x, y) to its clusters. A cluster is
+    [latitude, longitude, count, bounds] with bounds as [south, west, north,
+    east]; a single point is [latitude, longitude, 1, description], and
+    points that all share one location, which no zoom level can split, are
+    [latitude, longitude, count, descriptions].
+    """
+    cells = {}
+    for point in points:
+        x, y = project(point[1], point[2], zoom)
+        cells.setdefault((int(x // cell_size), int(y // cell_size)), []).append(point)
+
+    tiles = {}
+    for members in cells.values():
+        if len(members) == 1:
+            description, latitude, longitude = members[0][:3]
+            cluster = [latitude, longitude, 1, description]
+        elif len({(point[1], point[2]) for point in members}) == 1:
+            latitude, longitude = members[0][1:3]
+            cluster = [latitude, longitude, len(members), [point[0] for point in members]]
+        else:
+            latitudes = [point[1] for point in members]
+            longitudes = [point[2] for point in members]
+            latitude = sum(latitudes) / len(members)
+            longitude = sum(longitudes) / len(members)
+            bounds = [min(latitudes), min(longitudes), max(latitudes), max(longitudes)]
+            cluster = [round(latitude, 6), round(longitude, 6), len(members), bounds]
+
+        x, y = project(cluster[0], cluster[1], zoom)
+        tiles.setdefault((int(x // TILE_SIZE), int(y // TILE_SIZE)), []).append(cluster)
+
+    # Stable order so unchanged tiles are byte-identical between runs
+    for clusters in tiles.values():
+        clusters.sort(key=lambda cluster: (cluster[0], cluster[1]))
+    return tiles
+
+
+def is_leaf(cluster):
+    """True for a single point or points sharing one location, which deeper zooms cannot split."""
+    return cluster[2] == 1 or isinstance(cluster[3][0], str)
+
+
+def write_cluster_tiles(points, folder, max_zoom=MAX_ZOOM, cell_size=CELL_SIZE):
+    """Write pre-clustered tiles as folder/{z}/{x}/{y}.json, plus folder/index.json.
+
+    Levels stop early once every cluster is a single point or a group of
+    points at one location, whose descriptions are in the tile; the browser
+    reuses the deepest level beyond that. Tiles that are no longer produced
+    are deleted and unchanged tiles are not rewritten. Returns the number of
+    tiles in the index.
+    """
+    index = {"maxZoom": 0, "cellSize": cell_size, "tileSize": TILE_SIZE, "tiles": {}}
+    wanted = set()
+    for zoom in range(max_zoom + 1):
+        tiles = cluster_points(points, zoom, cell_size)
+        index["maxZoom"] = zoom
+        index["tiles"][str(zoom)] = sorted(f"{x}/{y}" for x, y in tiles)
+        for (x, y), clusters in tiles.items():
+            path = os.path.join(folder, str(zoom), str(x), f"{y}.json")
+            wanted.add(os.path.abspath(path))
+            write_if_changed(path, json.dumps(clusters, separators=(",", ":")))
+
+        if all(is_leaf(cluster) for clusters in tiles.values() for cluster in clusters):
+            break
+
+    write_if_changed(os.path.join(folder, "index.json"), json.dumps(index, separators=(",", ":")))
+
+    # Remove tiles left over from a previous, different set of points
+    for path in glob.glob(os.path.join(folder, "*", "*", "*.json")):
+        if os.path.abspath(path) not in wanted:
+            os.remove(path)
+    for directory, _, _ in sorted(os.walk(folder), reverse=True):
+        if directory != folder and not os.listdir(directory):
+            os.rmdir(directory)
+    return sum(len(tiles) for tiles in index["tiles"].values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geocode talk locations and build the talk map")
+    parser.add_argument("--talks", default="_talks/*.md", help="Glob of talk markdown files")
+    parser.add_argument("--index", default=DEFAULT_DB, help="Front matter index file ('' to disable)")
+    parser.add_argument("--output", default="talkmap", help="Output folder for the map")
+    parser.add_argument("--backend", choices=["nominatim", "gazetteer"], default="nominatim")
+    parser.add_argument("--gazetteer", help="Local gazetteer file (JSON or TSV) for --backend gazetteer")
+    parser.add_argument("--nominatim-url", help="Nominatim-compatible server, e.g. http://localhost:8080")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="Geocoder timeout, in seconds")
+    parser.add_argument("--cache", default=CACHE_FILE, help="Geocode cache file ('' to disable)")
+    parser.add_argument("--cache-ttl", type=float, default=CACHE_TTL / 86400, help="Cache lifetime, in days")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Concurrent geocoding requests")
+    parser.add_argument("--rate", type=float, default=RATE, help="Geocoding requests per second (0 = unlimited)")
+    parser.add_argument("--retries", type=int, default=RETRIES, help="Retries on timeouts and unavailable servers")
+    parser.add_argument("--failures", help="Write the per-location failure report to this JSON file")
+    parser.add_argument("--geojson", action="store_true", help="Also write org-locations.geojson")
+    parser.add_argument("--tiles", action="store_true",
+                        help="Also write pre-clustered tiles for map-tiled.html")
+    parser.add_argument("--max-zoom", type=int, default=MAX_ZOOM, help="Deepest zoom level to pre-cluster")
+    parser.add_argument("--cell-size", type=int, default=CELL_SIZE, help="Cluster grid cell size, in pixels")
+    args = parser.parse_args()
+
+    if args.backend == "gazetteer":
+        if not args.gazetteer:
+            parser.error("--backend gazetteer requires --gazetteer FILE")
+        backend = GazetteerBackend(args.gazetteer)
+    else:
+        backend = NominatimBackend(args.nominatim_url, timeout=args.timeout)
+
+    cache = GeocodeCache(args.cache, ttl=args.cache_ttl * 86400) if args.cache else None
+
+    # Only talks that are new, or whose location changed, need geocoding
+    js_file = os.path.join(args.output, "org-locations.js")
+    talks = load_talks(args.talks, args.index)
+    points, unresolved, stats = diff_address_points(talks, read_address_points(js_file))
+
+    # Perform geolocation
+    places, failures = geocode_locations(unresolved, backend, cache,
+                                         workers=args.workers, rate=args.rate, retries=args.retries)
+
+    for index, (file, description, location) in enumerate(talks):
+        if points[index] is None:
+            place = places[normalize_location(location)]
+            if place is not None:
+                points[index] = [description, place.latitude, place.longitude, file, location]
+            print(description, place)
+
+    report_failures(failures, args.failures)
+
+    if cache is not None:
+        cache.evict()
+        cache.save()
+
+    # Save the map data, leaving the file untouched when nothing changed
+    points = [point for point in points if point is not None]
+    written = write_if_changed(js_file, render_address_points(points))
+    print(f"{stats['added']} added, {stats['changed']} changed, {stats['unchanged']} unchanged, "
+          f"{stats['removed']} removed; {js_file} {'updated' if written else 'is up to date'}")
+
+    if args.geojson:
+        geojson_file = os.path.join(args.output, "org-locations.geojson")
+        write_if_changed(geojson_file, render_geojson(points))
+
+    if args.tiles:
+        tile_count = write_cluster_tiles(points, os.path.join(args.output, "clusters"),
+                                         max_zoom=args.max_zoom, cell_size=args.cell_size)
+        print(f"{tile_count} cluster tiles written to {os.path.join(args.output, 'clusters')}")
+
+
+if __name__ == "__main__":
+    main()